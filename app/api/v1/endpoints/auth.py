@@ -1,11 +1,21 @@
 # app/api/v1/endpoints/auth.py
-from datetime import datetime, timedelta
+import asyncio
+import hashlib
+import hmac
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
 from typing import Any
+from weakref import WeakValueDictionary
 
+import bcrypt
+import jwt
+from cachetools import TTLCache
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from jwt import PyJWK, PyJWTError
+from jwt.utils import base64url_encode
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
@@ -17,23 +27,43 @@ SECRET_KEY = "your-secret-key-change-in-production"  # Use env variable in produ
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Decode settings built once instead of on every request
+_ALG_LIST = [ALGORITHM]
+_JWT_DECODE_OPTS = {"require": ["exp", "sub"], "verify_aud": False}
+
+# HMAC key prepared once so decode skips per-call key parsing
+_HS256_KEY = PyJWK({"kty": "oct", "k": base64url_encode(SECRET_KEY.encode()).decode(), "alg": ALGORITHM})
+
 # Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+BCRYPT_ROUNDS = 12
+
+# bcrypt is CPU-bound, so it runs on a dedicated pool instead of the event loop
+_bcrypt_pool = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="bcrypt")
 
 # OAuth2 setup
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token")
 
+# Decoded token payloads keyed by token digest (raw tokens are never stored)
+_jwt_cache = TTLCache(maxsize=10000, ttl=30)
+
+# Recently authenticated users keyed by username
+_user_cache = TTLCache(maxsize=5000, ttl=60)
+_user_locks: "WeakValueDictionary[str, asyncio.Lock]" = WeakValueDictionary()
+
+# Users whose credentials were verified moments ago; failures are never cached
+_verified_credentials_cache = TTLCache(maxsize=1000, ttl=10)
+
 router = APIRouter()
 
 
 def verify_password(plain_password, hashed_password):
     """Verify password against hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
 
 
 def get_password_hash(password):
     """Hash password."""
-    return pwd_context.hash(password)
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode()
 
 
 async def get_user(db: AsyncSession, username: str):
@@ -42,13 +72,48 @@ async def get_user(db: AsyncSession, username: str):
     return result.scalars().first()
 
 
+async def get_cached_user(db: AsyncSession, username: str):
+    """
+    Get user by username, serving recent lookups from memory.
+
+    Concurrent cache misses for the same username share a single query.
+    """
+    user = _user_cache.get(username)
+    if user is not None:
+        return user
+
+    lock = _user_locks.get(username)
+    if lock is None:
+        lock = _user_locks[username] = asyncio.Lock()
+
+    async with lock:
+        user = _user_cache.get(username)
+        if user is None:
+            user = await get_user(db, username=username)
+            if user is not None:
+                _user_cache[username] = user
+    return user
+
+
+def _credentials_cache_key(username: str, password: str) -> bytes:
+    """Build the cache key for a username/password pair."""
+    return hmac.new(SECRET_KEY.encode(), f"{username}:{password}".encode(), "sha256").digest()
+
+
 async def authenticate_user(db: AsyncSession, username: str, password: str):
     """Authenticate user."""
+    key = _credentials_cache_key(username, password)
+    user = _verified_credentials_cache.get(key)
+    if user is not None:
+        return user
+
     user = await get_user(db, username)
     if not user:
         return False
-    if not verify_password(password, user.hashed_password):
+    loop = asyncio.get_running_loop()
+    if not await loop.run_in_executor(_bcrypt_pool, verify_password, password, user.hashed_password):
         return False
+    _verified_credentials_cache[key] = user
     return user
 
 
@@ -57,9 +122,9 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
     to_encode = data.copy()
     
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = int(time.time() + expires_delta.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = int(time.time()) + ACCESS_TOKEN_EXPIRE_MINUTES * 60
         
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
@@ -67,6 +132,33 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
     return encoded_jwt
 
 
+def _token_cache_key(token: str) -> str:
+    """Build the cache key for a raw JWT token."""
+    return hashlib.sha256(token.encode()).hexdigest()[:32]
+
+
+def decode_access_token(token: str) -> dict:
+    """
+    Decode JWT token, reusing the payload of recently verified tokens.
+
+    Only successfully decoded tokens are cached, and a cached payload is
+    never served past the token's own expiry.
+    """
+    key = _token_cache_key(token)
+    cached = _jwt_cache.get(key)
+    if cached is not None:
+        payload, expires_at = cached
+        if expires_at > time.time():
+            return payload
+        _jwt_cache.pop(key, None)
+
+    payload = jwt.decode(token, _HS256_KEY, algorithms=_ALG_LIST, options=_JWT_DECODE_OPTS)
+    expires_at = payload.get("exp")
+    if expires_at is not None:
+        _jwt_cache[key] = (payload, expires_at)
+    return payload
+
+
 async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)):
     """Get current user from token."""
     credentials_exception = HTTPException(
@@ -76,14 +168,17 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession
     )
     
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_access_token(token)
+        # Never let a stale (e.g. cached) payload reach the user lookup
+        if payload.get("exp", 0) < time.time():
+            raise credentials_exception
         username: str = payload.get("sub")
         if username is None:
             raise credentials_exception
-    except JWTError:
+    except PyJWTError:
         raise credentials_exception
         
-    user = await get_user(db, username=username)
+    user = await get_cached_user(db, username=username)
     if user is None:
         raise credentials_exception
         
@@ -97,8 +192,13 @@ async def get_current_active_user(current_user: User = Depends(get_current_user)
     return current_user
 
 
-async def get_admin_user(current_user: User = Depends(get_current_user)):
-    """Check if user is admin."""
+async def get_admin_user(current_user: User = Depends(get_current_active_user)):
+    """
+    Check if user is an active admin.
+    
+    Chained through get_current_active_user so the token decode and user
+    lookup from get_current_user run once per request and are shared.
+    """
     if not current_user.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, 
@@ -119,7 +219,8 @@ async def register_user(user_in: UserCreate, db: AsyncSession = Depends(get_db))
         )
     
     # Create new user
-    hashed_password = get_password_hash(user_in.password)
+    loop = asyncio.get_running_loop()
+    hashed_password = await loop.run_in_executor(_bcrypt_pool, get_password_hash, user_in.password)
     db_user = User(
         username=user_in.username,
         email=user_in.email,
@@ -130,6 +231,7 @@ async def register_user(user_in: UserCreate, db: AsyncSession = Depends(get_db))
     db.add(db_user)
     await db.commit()
     await db.refresh(db_user)
+    _user_cache.pop(user_in.username, None)
     
     return db_user
 
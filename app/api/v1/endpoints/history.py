@@ -1,14 +1,16 @@
 # app/api/v1/endpoints/history.py
-from typing import Any, Dict, List, Optional
-from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+from datetime import datetime, timezone
 from fastapi import APIRouter, Depends, Query, Path, HTTPException, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.dependencies import CommonDependencies
-from app.core.database import get_db
+from app.core.dependencies import get_history_service
+from app.services.history import HistoryService
+from app.core.database import get_db, get_session_factory
+from app.core.pagination import page_count
+from app.core.responses import ORJSONResponse, orjson_dumps
 from app.schemas.history import (
-    PriceHistoryResponse,
-    StockHistoryResponse,
     PriceHistoryListResponse,
     StockHistoryListResponse,
     CombinedHistoryResponse
@@ -16,141 +18,213 @@ from app.schemas.history import (
 
 router = APIRouter()
 
+_CURSOR_SEPARATOR = "|"
 
-@router.get("/price/{product_id}", response_model=PriceHistoryListResponse)
-async def get_price_history(
-    product_id: int = Path(..., gt=0, description="The ID of the product"),
-    start_date: Optional[datetime] = Query(None, description="Start date for filtering"),
-    end_date: Optional[datetime] = Query(None, description="End date for filtering"),
-    skip: int = Query(0, ge=0, description="Skip first N items"),
-    limit: int = Query(100, ge=1, le=100, description="Limit number of items returned"),
-    commons: CommonDependencies = Depends()
-) -> PriceHistoryListResponse:
+
+def _parse_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
     """
-    Get price history for a specific product.
+    Decode a ``<timestamp>|<id>`` keyset cursor, rejecting malformed values.
+    
+    History timestamps are stored as naive UTC, so a timezone-aware cursor
+    is converted to naive UTC before it is compared against them.
+    """
+    if not cursor:
+        return None
+    try:
+        timestamp, id_ = cursor.rsplit(_CURSOR_SEPARATOR, 1)
+        after_timestamp, after_id = datetime.fromisoformat(timestamp), int(id_)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    if after_timestamp.tzinfo is not None:
+        after_timestamp = after_timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return after_timestamp, after_id
+
+
+def _next_cursor(rows: List[Dict[str, Any]], limit: int) -> Optional[str]:
+    """
+    Encode the position after the last row of a full page as the next cursor.
+    """
+    if len(rows) < limit:
+        return None
+    last = rows[-1]
+    return f"{last['timestamp'].isoformat()}{_CURSOR_SEPARATOR}{last['id']}"
+
+
+def _check_date_range(start_date: Optional[datetime], end_date: Optional[datetime]) -> None:
+    """
+    Reject a date range whose start is after its end.
     """
     if start_date and end_date and start_date > end_date:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Start date cannot be later than end date"
         )
+
+
+def _ndjson_stream(
+    session_factory: Callable[[], AsyncSession],
+    rows_for: Callable[[AsyncSession], AsyncIterator[Dict[str, Any]]]
+) -> StreamingResponse:
+    """
+    Stream rows as newline-delimited JSON from a session owned by the response.
     
-    # Get the product to ensure it exists and to get its name
-    product = await commons.product_service.get_product(commons.db, id=product_id)
-    
-    if start_date or end_date:
-        history_items = await commons.history_service.get_price_history_by_date_range(
-            commons.db,
-            product_id=product_id,
-            start_date=start_date,
-            end_date=end_date,
-            skip=skip,
-            limit=limit
-        )
-    else:
-        history_items = await commons.history_service.get_price_history(
-            commons.db,
-            product_id=product_id,
-            skip=skip,
-            limit=limit
-        )
+    The request-scoped session from get_db is closed before the body is sent,
+    so the rows are read through a session opened inside the generator.
+    """
+    async def generate():
+        async with session_factory() as db:
+            async for row in rows_for(db):
+                yield orjson_dumps(row) + b"\n"
     
-    # Count total history records
-    total = len(await commons.history_service.price_history_repository.get_by_product_id(
-        commons.db,
-        product_id=product_id,
-        limit=1000  # Set a reasonable limit for counting
-    ))
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
+@router.get("/price/{product_id}", response_model=PriceHistoryListResponse, response_class=ORJSONResponse)
+async def get_price_history(
+    product_id: int = Path(..., gt=0, description="The ID of the product"),
+    start_date: Optional[datetime] = Query(None, description="Start date for filtering"),
+    end_date: Optional[datetime] = Query(None, description="End date for filtering"),
+    skip: int = Query(0, ge=0, description="Skip first N items"),
+    limit: int = Query(100, ge=1, le=100, description="Limit number of items returned"),
+    cursor: Optional[str] = Query(None, description="Continue after this cursor (next_cursor of the previous page); overrides skip"),
+    db: AsyncSession = Depends(get_db),
+    history_service: HistoryService = Depends(get_history_service)
+) -> ORJSONResponse:
+    """
+    Get price history for a specific product.
+    """
+    _check_date_range(start_date, end_date)
     
-    return PriceHistoryListResponse(
-        items=[PriceHistoryResponse.model_validate(item) for item in history_items],
-        total=total,
+    # Fetch the page and the total history count in a single query; the service checks the product exists
+    history_items, total = await history_service.get_price_history_page(
+        db,
         product_id=product_id,
-        page=skip // limit + 1 if limit > 0 else 1,
-        page_size=limit,
-        pages=(total + limit - 1) // limit if limit > 0 else 1
-
+        start_date=start_date,
+        end_date=end_date,
+        skip=skip,
+        limit=limit,
+        cursor=_parse_cursor(cursor)
     )
+    
+    return ORJSONResponse({
+        "items": history_items,
+        "total": total,
+        "product_id": product_id,
+        "page": skip // limit + 1 if limit > 0 else 1,
+        "page_size": limit,
+        "pages": page_count(total, limit),
+        "next_cursor": _next_cursor(history_items, limit)
+    })
 
 
-@router.get("/stock/{product_id}", response_model=StockHistoryListResponse)
+@router.get("/stock/{product_id}", response_model=StockHistoryListResponse, response_class=ORJSONResponse)
 async def get_stock_history(
     product_id: int = Path(..., gt=0, description="The ID of the product"),
     start_date: Optional[datetime] = Query(None, description="Start date for filtering"),
     end_date: Optional[datetime] = Query(None, description="End date for filtering"),
     skip: int = Query(0, ge=0, description="Skip first N items"),
     limit: int = Query(100, ge=1, le=100, description="Limit number of items returned"),
-    commons: CommonDependencies = Depends()
-) -> StockHistoryListResponse:
+    cursor: Optional[str] = Query(None, description="Continue after this cursor (next_cursor of the previous page); overrides skip"),
+    db: AsyncSession = Depends(get_db),
+    history_service: HistoryService = Depends(get_history_service)
+) -> ORJSONResponse:
     """
     Get stock history for a specific product.
     """
-    if start_date and end_date and start_date > end_date:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Start date cannot be later than end date"
-        )
+    _check_date_range(start_date, end_date)
     
-    # Get the product to ensure it exists and to get its name
-    product = await commons.product_service.get_product(commons.db, id=product_id)
+    # Fetch the page and the total history count in a single query; the service checks the product exists
+    history_items, total = await history_service.get_stock_history_page(
+        db,
+        product_id=product_id,
+        start_date=start_date,
+        end_date=end_date,
+        skip=skip,
+        limit=limit,
+        cursor=_parse_cursor(cursor)
+    )
     
-    if start_date or end_date:
-        history_items = await commons.history_service.get_stock_history_by_date_range(
-            commons.db,
-            product_id=product_id,
-            start_date=start_date,
-            end_date=end_date,
-            skip=skip,
-            limit=limit
-        )
-    else:
-        history_items = await commons.history_service.get_stock_history(
-            commons.db,
-            product_id=product_id,
-            skip=skip,
-            limit=limit
-        )
+    return ORJSONResponse({
+        "items": history_items,
+        "total": total,
+        "product_id": product_id,
+        "page": skip // limit + 1 if limit > 0 else 1,
+        "page_size": limit,
+        "pages": page_count(total, limit),
+        "next_cursor": _next_cursor(history_items, limit)
+    })
+
+
+@router.get("/price/{product_id}/stream", response_class=StreamingResponse)
+async def stream_price_history(
+    product_id: int = Path(..., gt=0, description="The ID of the product"),
+    start_date: Optional[datetime] = Query(None, description="Start date for filtering"),
+    end_date: Optional[datetime] = Query(None, description="End date for filtering"),
+    db: AsyncSession = Depends(get_db),
+    session_factory: Callable[[], AsyncSession] = Depends(get_session_factory),
+    history_service: HistoryService = Depends(get_history_service)
+) -> StreamingResponse:
+    """
+    Stream a product's full price history, latest first, as newline-delimited JSON.
+    """
+    _check_date_range(start_date, end_date)
+    await history_service.ensure_product_exists(db, product_id)
     
-    # Count total history records
-    total = len(await commons.history_service.stock_history_repository.get_by_product_id(
-        commons.db,
+    return _ndjson_stream(session_factory, lambda stream_db: history_service.stream_price_history(
+        stream_db,
         product_id=product_id,
-        limit=1000  # Set a reasonable limit for counting
+        start_date=start_date,
+        end_date=end_date
     ))
+
+
+@router.get("/stock/{product_id}/stream", response_class=StreamingResponse)
+async def stream_stock_history(
+    product_id: int = Path(..., gt=0, description="The ID of the product"),
+    start_date: Optional[datetime] = Query(None, description="Start date for filtering"),
+    end_date: Optional[datetime] = Query(None, description="End date for filtering"),
+    db: AsyncSession = Depends(get_db),
+    session_factory: Callable[[], AsyncSession] = Depends(get_session_factory),
+    history_service: HistoryService = Depends(get_history_service)
+) -> StreamingResponse:
+    """
+    Stream a product's full stock history, latest first, as newline-delimited JSON.
+    """
+    _check_date_range(start_date, end_date)
+    await history_service.ensure_product_exists(db, product_id)
     
-    return StockHistoryListResponse(
-        items=[StockHistoryResponse.model_validate(item) for item in history_items],
-        total=total,
+    return _ndjson_stream(session_factory, lambda stream_db: history_service.stream_stock_history(
+        stream_db,
         product_id=product_id,
-        page=skip // limit + 1 if limit > 0 else 1,
-        page_size=limit,
-        pages=(total + limit - 1) // limit if limit > 0 else 1
-    )
+        start_date=start_date,
+        end_date=end_date
+    ))
 
 
-@router.get("/combined/{product_id}", response_model=CombinedHistoryResponse)
+@router.get("/combined/{product_id}", response_model=CombinedHistoryResponse, response_class=ORJSONResponse)
 async def get_combined_history(
     product_id: int = Path(..., gt=0, description="The ID of the product"),
     start_date: Optional[datetime] = Query(None, description="Start date for filtering"),
     end_date: Optional[datetime] = Query(None, description="End date for filtering"),
     skip: int = Query(0, ge=0, description="Skip first N items"),
     limit: int = Query(100, ge=1, le=100, description="Limit number of items returned"),
-    commons: CommonDependencies = Depends()
-) -> CombinedHistoryResponse:
+    db: AsyncSession = Depends(get_db),
+    history_service: HistoryService = Depends(get_history_service)
+) -> ORJSONResponse:
     """
     Get combined price and stock history for a specific product.
     """
-    if start_date and end_date and start_date > end_date:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Start date cannot be later than end date"
-        )
+    _check_date_range(start_date, end_date)
     
-    return await commons.history_service.get_combined_history(
-        commons.db,
+    # The service already returns plain dicts built from trusted rows
+    return ORJSONResponse(await history_service.get_combined_history(
+        db,
         product_id=product_id,
         start_date=start_date,
         end_date=end_date,
         skip=skip,
         limit=limit
-    )
\ No newline at end of file
+    ))
\ No newline at end of file
@@ -1,11 +1,17 @@
 # app/api/v1/endpoints/product.py
+import re
 from typing import Any, Dict, List, Optional
 from fastapi import APIRouter, Depends, Query, Path, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.dependencies import CommonDependencies
+from app.core.dependencies import get_product_service
+from app.core.pagination import page_count, total_from_page
+from app.core.responses import ORJSONResponse
+from app.services.product import ProductService
+from app.repositories.product import product_to_dict
 from app.core.database import get_db
 from app.schemas.product import (
+    MAX_PRODUCT_BATCH_SIZE,
     ProductCreate,
     ProductUpdate,
     ProductResponse,
@@ -20,10 +26,15 @@ from app.schemas.supplier import SupplierResponse
 
 router = APIRouter()
 
+# Comma-separated product IDs, e.g. "1, 2,3"
+_ID_LIST_RE = re.compile(r"[\d,\s]*")
+_ID_RE = re.compile(r"\d+")
 
-@router.get("/", response_model=ProductListResponse)
+
+@router.get("/", response_model=ProductListResponse, response_class=ORJSONResponse)
 async def get_products(
-    commons: CommonDependencies = Depends(),
+    db: AsyncSession = Depends(get_db),
+    product_service: ProductService = Depends(get_product_service),
     skip: int = Query(0, ge=0, description="Skip first N items"),
     limit: int = Query(10, ge=1, le=100, description="Limit number of items returned"),
     page: Optional[int] = Query(None, ge=1, description="Page number"),
@@ -36,7 +47,7 @@ async def get_products(
     max_stock: Optional[int] = Query(None, ge=0, description="Maximum stock quantity"),
     sort: Optional[str] = Query(None, description="Sort by field"),
     order: Optional[str] = Query("asc", description="Sort order (asc or desc)")
-) -> ProductListResponse:
+) -> ORJSONResponse:
     """
     Get list of products with filtering, sorting and pagination.
     """
@@ -65,69 +76,84 @@ async def get_products(
 
     # Get products with the correct pagination parameters
     if name:
-        products = await commons.product_service.search_products(
-            commons.db,
+        # The total number of matches comes back with the page via a window function
+        products, total = await product_service.search_products_with_total(
+            db,
             search_term=name,
             skip=skip,
             limit=limit,  # Use the calculated limit
             **filters
         )
-    else:
-        products = await commons.product_service.get_products(
-            commons.db,
+        items = [product_to_dict(product) for product in products]
+    elif filters:
+        # The total comes back with the page via a window function
+        products, total = await product_service.get_products_with_total(
+            db,
             skip=skip,
             limit=limit,  # Use the calculated limit
             sort_by=sort,
             sort_order=order,
             **filters
         )
+        items = [product_to_dict(product) for product in products]
+    else:
+        # Unfiltered pages come back as ready-made payloads from the listing cache
+        items = await product_service.get_products(
+            db,
+            skip=skip,
+            limit=limit,  # Use the calculated limit
+            sort_by=sort,
+            sort_order=order
+        )
 
-    # Count total products (without pagination)
-    total = await commons.product_service.product_repository.count(commons.db, **filters)
+        # A short page already gives the exact total; otherwise unfiltered
+        # totals come from planner statistics instead of a full-table count
+        total = total_from_page(skip, limit, len(items))
+        if total is None:
+            total = await product_service.product_repository.count_estimate(db)
 
     # Use consistent calculation for response
     current_page = page if page is not None else (actual_skip // actual_size + 1 if actual_size > 0 else 1)
     current_size = actual_size
 
-    return ProductListResponse(
-        items=products,
-        total=total,
-        page=current_page,
-        size=current_size,
-        pages=(total + current_size - 1) // current_size if current_size > 0 else 1
-    )
+    return ORJSONResponse({
+        "items": items,
+        "total": total,
+        "page": current_page,
+        "size": current_size,
+        "pages": page_count(total, current_size)
+    })
 
 @router.post("/", response_model=ProductResponse, status_code=status.HTTP_201_CREATED)
 async def create_product(
     product_in: ProductCreate,
-    commons: CommonDependencies = Depends()
+    db: AsyncSession = Depends(get_db),
+    product_service: ProductService = Depends(get_product_service)
 ) -> ProductResponse:
     """
     Create a new product.
     """
-    return await commons.product_service.create_product(commons.db, product_in=product_in)
+    return await product_service.create_product(db, product_in=product_in)
 
 
 @router.get("/{product_id}", response_model=ProductResponse)
 async def get_product(
     product_id: int = Path(..., gt=0, description="The ID of the product"),
-    commons: CommonDependencies = Depends()
+    db: AsyncSession = Depends(get_db),
+    product_service: ProductService = Depends(get_product_service)
 ) -> ProductResponse:
     """
     Get a product by ID.
     """
-    product = await commons.product_service.get_product(commons.db, id=product_id)
-    # Ensure suppliers is properly initialized if empty
-    if not hasattr(product, 'suppliers') or product.suppliers is None:
-        product.suppliers = []
-    return product
+    return await product_service.get_product(db, id=product_id)
 
 
 @router.put("/{product_id}", response_model=ProductResponse)
 async def update_product(
     product_in: ProductUpdate,
     product_id: int = Path(..., gt=0, description="The ID of the product"),
-    commons: CommonDependencies = Depends()
+    db: AsyncSession = Depends(get_db),
+    product_service: ProductService = Depends(get_product_service)
 ) -> ProductResponse:
     """
     Update a product by ID.
@@ -135,8 +161,8 @@ async def update_product(
     update_data = product_in.model_dump(exclude_unset=True)
     change_reason = update_data.pop("change_reason", None)
 
-    return await commons.product_service.update_product(
-        commons.db,
+    return await product_service.update_product(
+        db,
         id=product_id,
         product_in=update_data,
         change_reason=change_reason
@@ -146,22 +172,24 @@ async def update_product(
 @router.delete("/{product_id}", response_model=ProductResponse)
 async def delete_product(
     product_id: int = Path(..., gt=0, description="The ID of the product"),
-    commons: CommonDependencies = Depends()
+    db: AsyncSession = Depends(get_db),
+    product_service: ProductService = Depends(get_product_service)
 ) -> ProductResponse:
     """
     Delete a product by ID.
     """
-    return await commons.product_service.delete_product(commons.db, id=product_id)
+    return await product_service.delete_product(db, id=product_id)
 
 
 @router.post("/batch", response_model=Dict[str, List[ProductResponse]], status_code=status.HTTP_201_CREATED)
 async def batch_create_products(
     batch_create_request: ProductBatchCreateRequest,
-    commons: CommonDependencies = Depends()
+    db: AsyncSession = Depends(get_db),
+    product_service: ProductService = Depends(get_product_service)
 ) -> Dict[str, List[ProductResponse]]:
     """Create multiple products in a batch."""
-    created_products = await commons.product_service.batch_create_products(
-        commons.db,
+    created_products = await product_service.batch_create_products(
+        db,
         products_in=batch_create_request.products
     )
     return {"products": created_products}
@@ -170,7 +198,8 @@ async def batch_create_products(
 @router.put("/batch", response_model=Dict[str, List[ProductResponse]])
 async def batch_update_products(
     batch_update_request: ProductBatchUpdateRequest,
-    commons: CommonDependencies = Depends()
+    db: AsyncSession = Depends(get_db),
+    product_service: ProductService = Depends(get_product_service)
 ) -> Dict[str, List[ProductResponse]]:
     """
     Update multiple products in a batch.
@@ -185,8 +214,8 @@ async def batch_update_products(
         updates.append(update_dict)
     
     try:
-        updated_products = await commons.product_service.batch_update_products(
-            commons.db,
+        updated_products = await product_service.batch_update_products(
+            db,
             updates=updates
         )
         
@@ -197,8 +226,8 @@ async def batch_update_products(
         if e.status_code == 404 and "not found" in e.detail.lower():
             # Find the products that were successfully updated
             # To maintain compatibility, silently skip products that don't exist
-            updated_products = await commons.product_service.batch_update_products_silently(
-                commons.db,
+            updated_products = await product_service.batch_update_products_silently(
+                db,
                 updates=updates
             )
             return {"updated": updated_products}
@@ -208,7 +237,8 @@ async def batch_update_products(
 @router.delete("/batch", response_model=Dict[str, List[int]])
 async def batch_delete_products(
     product_ids: str = Query(..., description="Comma-separated product IDs to delete"),
-    commons: CommonDependencies = Depends()
+    db: AsyncSession = Depends(get_db),
+    product_service: ProductService = Depends(get_product_service)
 ) -> Dict[str, List[int]]:
     """
     Delete multiple products by IDs.
@@ -218,37 +248,27 @@ async def batch_delete_products(
     """
     try:
         # Parse the comma-separated IDs
-        ids = [int(id_str.strip()) for id_str in product_ids.split(",") if id_str.strip()]
+        if not _ID_LIST_RE.fullmatch(product_ids):
+            raise ValueError(product_ids)
+        ids = list(map(int, _ID_RE.findall(product_ids)))
         
         if not ids:
             raise HTTPException(
                 status_code=400,
                 detail="No valid product IDs provided"
             )
-        
-        # Get deleted products (maintain existing behavior)
-        try:
-            deleted_products = await commons.product_service.batch_delete_products(
-                commons.db,
-                ids=ids
+        if len(ids) > MAX_PRODUCT_BATCH_SIZE:
+            raise HTTPException(
+                status_code=400,
+                detail=f"At most {MAX_PRODUCT_BATCH_SIZE} product IDs can be deleted at once"
             )
-            
-            # Return just the IDs of deleted products
-            return {"deleted": [p.id for p in deleted_products]}
-        except HTTPException as e:
-            # If non-existent products were detected, just filter them out silently
-            # This maintains backward compatibility with the original implementation
-            if e.status_code == 404 and "not found" in e.detail.lower():
-                # Find the IDs that were successfully deleted
-                # Implementation depends on service returning specific messages
-                # This is a workaround - better to update the service method
-                deleted_products = await commons.product_service.batch_delete_products_silently(
-                    commons.db,
-                    ids=ids
-                )
-                return {"deleted": [p.id for p in deleted_products]}
-            else:
-                raise
+        
+        # Missing IDs are skipped, so the response lists only what was deleted
+        deleted_products = await product_service.batch_delete_products_silently(
+            db,
+            ids=ids
+        )
+        return {"deleted": [p.id for p in deleted_products]}
             
     except ValueError:
         raise HTTPException(
@@ -256,39 +276,19 @@ async def batch_delete_products(
             detail="Invalid product IDs format. Must be comma-separated integers."
         )
 
-async def batch_delete_products_silently(
-    self,
-    db: AsyncSession,
-    *,
-    ids: List[int]
-) -> List[ProductResponse]:
-    """
-    Delete multiple products in a batch, silently skipping any that don't exist.
-    This method maintains compatibility with the original implementation.
-    """
-    deleted_products = []
-    
-    for product_id in ids:
-        product = await self.product_repository.get(db, id=product_id)
-        if product:
-            # Keep a copy of the product before deletion
-            deleted_products.append(product)
-            await self.product_repository.delete(db, id=product_id)
-    
-    return deleted_products
-
 @router.get("/low-stock", response_model=List[ProductResponse])
 async def get_low_stock_products(
     threshold: int = Query(10, ge=0, description="Stock threshold"),
     skip: int = Query(0, ge=0, description="Skip first N items"),
     limit: int = Query(100, ge=1, le=100, description="Limit number of items returned"),
-    commons: CommonDependencies = Depends()
+    db: AsyncSession = Depends(get_db),
+    product_service: ProductService = Depends(get_product_service)
 ) -> List[ProductResponse]:
     """
     Get products with stock quantity below the specified threshold.
     """
-    return await commons.product_service.get_low_stock_products(
-        commons.db,
+    return await product_service.get_low_stock_products(
+        db,
         threshold=threshold,
         skip=skip,
         limit=limit
@@ -299,19 +299,20 @@ async def get_low_stock_products(
 async def add_supplier_to_product(
     product_id: int = Path(..., gt=0, description="The ID of the product"),
     supplier_id: int = Path(..., gt=0, description="The ID of the supplier"),
-    commons: CommonDependencies = Depends()
+    db: AsyncSession = Depends(get_db),
+    product_service: ProductService = Depends(get_product_service)
 ) -> ProductResponse:
     """
     Add a supplier to a product.
     """
-    return await commons.product_service.add_supplier_to_product(
-        commons.db,
+    return await product_service.add_supplier_to_product(
+        db,
         product_id=product_id,
         supplier_id=supplier_id
     )
 
 
-@router.get("/search", response_model=ProductListResponse)
+@router.get("/search", response_model=ProductListResponse, response_class=ORJSONResponse)
 async def search_products(
     query: str = Query(..., description="Search query"),
     skip: int = Query(0, ge=0, description="Skip first N items"),
@@ -321,8 +322,9 @@ async def search_products(
     max_price: Optional[float] = Query(None, ge=0, description="Maximum price"),
     min_stock: Optional[int] = Query(None, ge=0, description="Minimum stock quantity"),
     max_stock: Optional[int] = Query(None, ge=0, description="Maximum stock quantity"),
-    commons: CommonDependencies = Depends()
-):
+    db: AsyncSession = Depends(get_db),
+    product_service: ProductService = Depends(get_product_service)
+) -> ORJSONResponse:
     """
     Search for products by name or description with filtering options.
     """
@@ -339,41 +341,44 @@ async def search_products(
         filters["stock_range"] = {"min": min_stock, "max": max_stock}
     
     # Get filtered search results
-    products = await commons.product_service.search_products(
-        commons.db,
+    products = await product_service.search_products(
+        db,
         search_term=query,
         skip=skip,
         limit=limit,
         **filters
     )
 
-    # Count total matching products with the same filters
-    total = await commons.product_service.count_search_results(
-        commons.db, 
-        search_term=query,
-        **filters
-    )
+    # Count total matching products with the same filters, unless the page already shows it
+    total = total_from_page(skip, limit, len(products))
+    if total is None:
+        total = await product_service.count_search_results(
+            db, 
+            search_term=query,
+            **filters
+        )
 
-    return ProductListResponse(
-        items=products,
-        total=total,
-        page=skip // limit + 1 if limit > 0 else 1,
-        size=limit,
-        pages=(total + limit - 1) // limit if limit > 0 else 1
-    )
+    return ORJSONResponse({
+        "items": [product_to_dict(product) for product in products],
+        "total": total,
+        "page": skip // limit + 1 if limit > 0 else 1,
+        "size": limit,
+        "pages": page_count(total, limit)
+    })
 
 
 @router.delete("/{product_id}/suppliers/{supplier_id}", response_model=ProductResponse)
 async def remove_supplier_from_product(
     product_id: int = Path(..., gt=0, description="The ID of the product"),
     supplier_id: int = Path(..., gt=0, description="The ID of the supplier"),
-    commons: CommonDependencies = Depends()
+    db: AsyncSession = Depends(get_db),
+    product_service: ProductService = Depends(get_product_service)
 ) -> ProductResponse:
     """
     Remove a supplier from a product.
     """
-    return await commons.product_service.remove_supplier_from_product(
-        commons.db,
+    return await product_service.remove_supplier_from_product(
+        db,
         product_id=product_id,
         supplier_id=supplier_id
     )
@@ -381,40 +386,35 @@ async def remove_supplier_from_product(
 
 @router.get("/statistics", response_model=Dict[str, Any])
 async def get_product_statistics(
-    commons: CommonDependencies = Depends()
+    db: AsyncSession = Depends(get_db),
+    product_service: ProductService = Depends(get_product_service)
 ) -> Dict[str, Any]:
     """
     Get product statistics.
     """
-    return await commons.product_service.get_product_statistics(commons.db)
+    return await product_service.get_product_statistics(db)
 
 
 @router.get("/{product_id}/suppliers", response_model=Dict[str, List[SupplierResponse]])
 async def get_product_suppliers(
     product_id: int = Path(..., gt=0, description="The ID of the product"),
-    commons: CommonDependencies = Depends()
+    db: AsyncSession = Depends(get_db),
+    product_service: ProductService = Depends(get_product_service)
 ) -> Dict[str, List[SupplierResponse]]:
     """
     Get all suppliers for a product.
     """
-    suppliers = await commons.product_service.get_product_suppliers(
-        commons.db,
+    suppliers = await product_service.get_product_suppliers(
+        db,
         product_id=product_id
     )
 
-    supplier_dicts = [
-        {
-            "id": supplier.id,
-            "name": supplier.name,
-            "contact_info": supplier.contact_info,
-            "credit_rating": supplier.credit_rating,
-            "created_at": supplier.created_at,
-            "updated_at": supplier.updated_at
-        }
+    # Suppliers come straight from the database, so skip re-validation
+    supplier_responses = [
+        SupplierResponse.model_construct(
+            **{field: getattr(supplier, field) for field in SupplierResponse.model_fields}
+        )
         for supplier in suppliers
     ]
-
-    supplier_responses = [SupplierResponse.model_validate(supplier_dict) 
-                          for supplier_dict in supplier_dicts]
     
     return {"suppliers": supplier_responses}
\ No newline at end of file
@@ -1,10 +1,15 @@
 # app/api/v1/endpoints/supplier.py
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 from fastapi import APIRouter, Depends, Query, Path, HTTPException, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.dependencies import CommonDependencies
-from app.core.database import get_db
+from app.core.dependencies import get_supplier_service
+from app.services.supplier import SupplierService
+from app.repositories.supplier import supplier_to_dict
+from app.core.database import get_db, get_session_factory
+from app.core.pagination import page_count
+from app.core.responses import ORJSONResponse, orjson_dumps
 from app.schemas.supplier import (
     SupplierCreate,
     SupplierUpdate,
@@ -13,43 +18,58 @@ from app.schemas.supplier import (
     SupplierBatchCreateRequest,
     SupplierBatchUpdateRequest,
     SupplierBatchDeleteRequest,
+    SupplierSortField,
+    SortOrder,
 )
 
 router = APIRouter()
 
 
-@router.get("/", response_model=SupplierListResponse)
+@router.get("/", response_model=SupplierListResponse, response_class=ORJSONResponse)
 async def get_suppliers(
-    commons: CommonDependencies = Depends(),
+    db: AsyncSession = Depends(get_db),
+    supplier_service: SupplierService = Depends(get_supplier_service),
     skip: int = Query(0, ge=0, description="Skip first N items"),
     limit: int = Query(100, ge=1, le=100, description="Limit number of items returned"),
-    name: Optional[str] = Query(None, description="Filter by supplier name (case-insensitive)"),
+    name: Optional[str] = Query(None, description="Filter by supplier name (case-insensitive); end with * for a prefix match"),
+    q: Optional[str] = Query(None, min_length=1, description="Full-text search across name and contact info"),
     min_rating: Optional[int] = Query(None, ge=0, le=5, description="Minimum credit rating"),
     max_rating: Optional[int] = Query(None, ge=0, le=5, description="Maximum credit rating"),
-    sort_by: Optional[str] = Query(None, description="Sort by field"),
-    sort_order: Optional[str] = Query("asc", description="Sort order (asc or desc)")
-) -> SupplierListResponse:
+    sort_by: Optional[SupplierSortField] = Query(None, description="Sort by field"),
+    sort_order: SortOrder = Query("asc", description="Sort order (asc or desc)")
+) -> ORJSONResponse:
     """
     Get list of suppliers with filtering, sorting and pagination.
     """
     # Prepare filters
     filters = {}
     
-    if min_rating is not None or max_rating is not None:
-        filters["credit_rating"] = {"min": min_rating, "max": max_rating}
+    if min_rating is not None:
+        filters["credit_rating_min"] = min_rating
+    if max_rating is not None:
+        filters["credit_rating_max"] = max_rating
     
-    # Search by name or get all with filters
-    if name:
-        suppliers = await commons.supplier_service.search_suppliers(
-            commons.db,
+    # Full-text search, search by name or get all with filters;
+    # the total comes back in the same query
+    if q:
+        suppliers, total = await supplier_service.full_text_search_suppliers_with_total(
+            db,
+            text_query=q,
+            skip=skip,
+            limit=limit,
+            **filters
+        )
+    elif name:
+        suppliers, total = await supplier_service.search_suppliers_with_total(
+            db,
             search_term=name,
             skip=skip,
             limit=limit,
             **filters
         )
     else:
-        suppliers = await commons.supplier_service.get_suppliers(
-            commons.db,
+        suppliers, total = await supplier_service.get_suppliers_with_total(
+            db,
             skip=skip,
             limit=limit,
             sort_by=sort_by,
@@ -57,137 +77,170 @@ async def get_suppliers(
             **filters
         )
     
-    # Count total suppliers (without pagination)
-    total = await commons.supplier_service.supplier_repository.count(commons.db, **filters)
+    return ORJSONResponse({
+        "items": [supplier_to_dict(supplier) for supplier in suppliers],
+        "total": total,
+        "page": skip // limit + 1 if limit > 0 else 1,
+        "page_size": limit,
+        "pages": page_count(total, limit),
+    })
+
+
+
+@router.get("/stream", response_class=StreamingResponse)
+async def stream_suppliers(
+    session_factory: Callable[[], AsyncSession] = Depends(get_session_factory),
+    supplier_service: SupplierService = Depends(get_supplier_service),
+    min_rating: Optional[int] = Query(None, ge=0, le=5, description="Minimum credit rating"),
+    max_rating: Optional[int] = Query(None, ge=0, le=5, description="Maximum credit rating")
+) -> StreamingResponse:
+    """
+    Stream all matching suppliers as newline-delimited JSON.
+    
+    The stream owns its session: the request-scoped one from get_db is
+    closed before the response body is sent.
+    """
+    filters = {}
     
-    # Use model_dump to convert SQLAlchemy models to dictionaries first
-    supplier_dicts = [
-        {
-            "id": supplier.id,
-            "name": supplier.name,
-            "contact_info": supplier.contact_info,
-            "credit_rating": supplier.credit_rating,
-            "created_at": supplier.created_at,
-            "updated_at": supplier.updated_at
-            # Add any other fields that exist in your model
-        }
-        for supplier in suppliers
-    ]
+    if min_rating is not None:
+        filters["credit_rating_min"] = min_rating
+    if max_rating is not None:
+        filters["credit_rating_max"] = max_rating
     
-    # Now validate the dictionaries
-    supplier_responses = [SupplierResponse.model_validate(supplier_dict) for supplier_dict in supplier_dicts]
+    async def generate():
+        async with session_factory() as db:
+            async for supplier in supplier_service.stream_suppliers(db, **filters):
+                yield orjson_dumps(supplier_to_dict(supplier)) + b"\n"
     
-    return SupplierListResponse(
-        items=supplier_responses,
-        total=total,
-        page=skip // limit + 1 if limit > 0 else 1,
-        page_size=limit,
-        pages=(total + limit - 1) // limit if limit > 0 else 1
-    )
-
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
 
 
-@router.post("/", response_model=SupplierResponse, status_code=status.HTTP_201_CREATED)
+@router.post("/", response_model=SupplierResponse, response_class=ORJSONResponse, status_code=status.HTTP_201_CREATED)
 async def create_supplier(
     supplier_in: SupplierCreate,
-    commons: CommonDependencies = Depends()
-) -> SupplierResponse:
+    db: AsyncSession = Depends(get_db),
+    supplier_service: SupplierService = Depends(get_supplier_service)
+) -> ORJSONResponse:
     """
     Create a new supplier.
     """
-    return await commons.supplier_service.create_supplier(commons.db, supplier_in=supplier_in)
+    supplier = await supplier_service.create_supplier(db, supplier_in=supplier_in)
+    return ORJSONResponse(supplier_to_dict(supplier), status_code=status.HTTP_201_CREATED)
 
 
-@router.get("/{supplier_id}", response_model=SupplierResponse)
+@router.get("/top-rated", response_model=List[SupplierResponse], response_class=ORJSONResponse)
+async def get_top_rated_suppliers(
+    limit: int = Query(10, ge=1, le=100, description="Number of suppliers to return"),
+    after_rating: Optional[int] = Query(None, ge=0, le=5, description="Credit rating of the last supplier on the previous page"),
+    after_id: Optional[int] = Query(None, gt=0, description="ID of the last supplier on the previous page"),
+    db: AsyncSession = Depends(get_db),
+    supplier_service: SupplierService = Depends(get_supplier_service)
+) -> ORJSONResponse:
+    """
+    Get the top-rated suppliers.
+    
+    Pass the credit rating and ID of the last supplier returned to fetch the next page.
+    """
+    suppliers = await supplier_service.get_top_rated_suppliers(
+        db,
+        limit=limit,
+        after_rating=after_rating,
+        after_id=after_id
+    )
+    return ORJSONResponse([supplier_to_dict(supplier) for supplier in suppliers])
+
+
+@router.get("/{supplier_id}", response_model=SupplierResponse, response_class=ORJSONResponse)
 async def get_supplier(
     supplier_id: int = Path(..., gt=0, description="The ID of the supplier"),
-    commons: CommonDependencies = Depends()
-) -> SupplierResponse:
+    db: AsyncSession = Depends(get_db),
+    supplier_service: SupplierService = Depends(get_supplier_service)
+) -> ORJSONResponse:
     """
     Get a supplier by ID.
     """
-    return await commons.supplier_service.get_supplier(commons.db, id=supplier_id)
+    supplier = await supplier_service.get_supplier(db, id=supplier_id)
+    return ORJSONResponse(supplier_to_dict(supplier))
 
 
-@router.put("/{supplier_id}", response_model=SupplierResponse)
+@router.put("/{supplier_id}", response_model=SupplierResponse, response_class=ORJSONResponse)
 async def update_supplier(
     supplier_in: SupplierUpdate,
     supplier_id: int = Path(..., gt=0, description="The ID of the supplier"),
-    commons: CommonDependencies = Depends()
-) -> SupplierResponse:
+    db: AsyncSession = Depends(get_db),
+    supplier_service: SupplierService = Depends(get_supplier_service)
+) -> ORJSONResponse:
     """
     Update a supplier by ID.
     """
-    return await commons.supplier_service.update_supplier(
-        commons.db,
+    supplier = await supplier_service.update_supplier(
+        db,
         id=supplier_id,
         supplier_in=supplier_in
     )
+    return ORJSONResponse(supplier_to_dict(supplier))
 
 
-@router.delete("/{supplier_id}", response_model=SupplierResponse)
+@router.delete("/{supplier_id}", response_model=SupplierResponse, response_class=ORJSONResponse)
 async def delete_supplier(
     supplier_id: int = Path(..., gt=0, description="The ID of the supplier"),
-    commons: CommonDependencies = Depends()
-) -> SupplierResponse:
+    db: AsyncSession = Depends(get_db),
+    supplier_service: SupplierService = Depends(get_supplier_service)
+) -> ORJSONResponse:
     """
     Delete a supplier by ID.
     """
-    return await commons.supplier_service.delete_supplier(commons.db, id=supplier_id)
+    supplier = await supplier_service.delete_supplier(db, id=supplier_id)
+    return ORJSONResponse(supplier_to_dict(supplier))
 
 
-@router.post("/batch/create", response_model=List[SupplierResponse], status_code=status.HTTP_201_CREATED)
+@router.post("/batch/create", response_model=List[SupplierResponse], response_class=ORJSONResponse, status_code=status.HTTP_201_CREATED)
 async def batch_create_suppliers(
     batch_create_request: SupplierBatchCreateRequest,
-    commons: CommonDependencies = Depends()
-) -> List[SupplierResponse]:
+    db: AsyncSession = Depends(get_db),
+    supplier_service: SupplierService = Depends(get_supplier_service)
+) -> ORJSONResponse:
     """
     Create multiple suppliers in a batch.
     """
-    return await commons.supplier_service.batch_create_suppliers(
-        commons.db,
+    suppliers = await supplier_service.batch_create_suppliers(
+        db,
         suppliers_in=batch_create_request.suppliers
     )
+    return ORJSONResponse(
+        [supplier_to_dict(supplier) for supplier in suppliers],
+        status_code=status.HTTP_201_CREATED
+    )
 
 
-@router.put("/batch/update", response_model=List[SupplierResponse])
+@router.put("/batch/update", response_model=List[SupplierResponse], response_class=ORJSONResponse)
 async def batch_update_suppliers(
     batch_update_request: SupplierBatchUpdateRequest,
-    commons: CommonDependencies = Depends()
-) -> List[SupplierResponse]:
+    db: AsyncSession = Depends(get_db),
+    supplier_service: SupplierService = Depends(get_supplier_service)
+) -> ORJSONResponse:
     """
     Update multiple suppliers in a batch.
     """
-    return await commons.supplier_service.batch_update_suppliers(
-        commons.db,
+    suppliers = await supplier_service.batch_update_suppliers(
+        db,
         ids=batch_update_request.supplier_ids,
         update_data=batch_update_request.update_data
     )
+    return ORJSONResponse([supplier_to_dict(supplier) for supplier in suppliers])
 
 
-@router.post("/batch/delete", response_model=List[SupplierResponse])
+@router.post("/batch/delete", response_model=List[SupplierResponse], response_class=ORJSONResponse)
 async def batch_delete_suppliers(
     batch_delete_request: SupplierBatchDeleteRequest,
-    commons: CommonDependencies = Depends()
-) -> List[SupplierResponse]:
+    db: AsyncSession = Depends(get_db),
+    supplier_service: SupplierService = Depends(get_supplier_service)
+) -> ORJSONResponse:
     """
     Delete multiple suppliers in a batch.
     """
-    return await commons.supplier_service.batch_delete_suppliers(
-        commons.db,
+    suppliers = await supplier_service.batch_delete_suppliers(
+        db,
         ids=batch_delete_request.supplier_ids
     )
-
-
-@router.get("/top-rated", response_model=List[SupplierResponse])
-async def get_top_rated_suppliers(
-    limit: int = Query(10, ge=1, le=100, description="Number of suppliers to return"),
-    commons: CommonDependencies = Depends()
-) -> List[SupplierResponse]:
-    """
-    Get the top-rated suppliers.
-    """
-    return await commons.supplier_service.get_top_rated_suppliers(
-        commons.db,
-        limit=limit
-    )
\ No newline at end of file
+    return ORJSONResponse([supplier_to_dict(supplier) for supplier in suppliers])
@@ -1,8 +1,9 @@
 # app/core/config.py
 import os
-from typing import Any, Dict, Optional
-from pydantic import PostgresDsn, validator
-from pydantic_settings import BaseSettings
+from functools import lru_cache
+from typing import Any, Optional
+from pydantic import Field, PostgresDsn, ValidationInfo, field_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     """
@@ -18,16 +19,18 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str = os.getenv("POSTGRES_PASSWORD", "password")
     POSTGRES_DB: str = os.getenv("POSTGRES_DB", "product_service")
     POSTGRES_PORT: str = os.getenv("POSTGRES_PORT", "5432")
-    SQLALCHEMY_DATABASE_URI: Optional[str] = None  # Changed to str
+    SQLALCHEMY_DATABASE_URI: Optional[str] = Field(default=None, validate_default=True)
     
     # Database connection pool settings
-    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
-    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "20"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "40"))
     DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
     DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
     DB_ECHO_LOG: bool = os.getenv("DB_ECHO_LOG", "False").lower() == "true"
     DB_RETRY_LIMIT: int = int(os.getenv("DB_RETRY_LIMIT", "3"))
     DB_RETRY_INTERVAL: int = int(os.getenv("DB_RETRY_INTERVAL", "1"))
+    # asyncpg prepared statement caches (set to 0 behind pgbouncer transaction pooling)
+    DB_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "1024"))
     
     # CORS Settings
     CORS_ORIGINS: list = ["*"]
@@ -36,11 +39,16 @@ class Settings(BaseSettings):
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
     
-    @validator("SQLALCHEMY_DATABASE_URI", pre=True)
-    def assemble_db_connection(cls, v: Optional[str], values: Dict[str, Any]) -> Any:
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=True, frozen=True)
+    
+    @field_validator("SQLALCHEMY_DATABASE_URI", mode="before")
+    @classmethod
+    def assemble_db_connection(cls, v: Optional[str], info: ValidationInfo) -> Any:
         if isinstance(v, str):
             return v
         
+        values = info.data
+        
         # Build the PostgresDsn
         dsn = PostgresDsn.build(
             scheme="postgresql+asyncpg",
@@ -53,10 +61,14 @@ class Settings(BaseSettings):
         
         # Convert to string before returning
         return str(dsn)
-    
-    class Config:
-        case_sensitive = True
-        env_file = ".env"
 
-# Create settings instance
-settings = Settings()
\ No newline at end of file
+
+@lru_cache
+def get_settings() -> Settings:
+    """
+    Return the process-wide settings, reading the environment and .env once.
+    """
+    return Settings()
+
+
+settings = get_settings()
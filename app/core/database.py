@@ -1,10 +1,10 @@
 # app/core/database.py
+import asyncio
 import logging
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Callable
 
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import DeclarativeBase, sessionmaker
 from tenacity import retry, stop_after_attempt, wait_fixed
 
 from sqlalchemy import text
@@ -16,11 +16,23 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Create async engine 
-# Note: Async engines use their own pooling mechanism automatically
+# asyncpg caches prepared statements per connection, so hot queries skip
+# server-side parse/plan once the pooled connection has seen them.
+# JIT compilation only pays off for long analytical queries, not short OLTP ones.
 engine = create_async_engine(
     settings.SQLALCHEMY_DATABASE_URI,
     echo=settings.DB_ECHO_LOG,
     pool_pre_ping=True,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    insertmanyvalues_page_size=1000,
+    connect_args={
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "server_settings": {"jit": "off", "application_name": "product-service"},
+    },
 )
 
 # Create async session factory
@@ -29,21 +41,24 @@ AsyncSessionLocal = async_sessionmaker(
     engine, expire_on_commit=False, class_=AsyncSession
 )
 
+# Advisory lock key serializing schema creation across workers
+SCHEMA_LOCK_ID = 73_100_001
+
 # Create base class for SQLAlchemy models
-Base = declarative_base()
+class Base(DeclarativeBase):
+    pass
 
 async def get_engine(max_retries=None, retry_interval=None):
     return engine
 
 
-@retry(
-    stop=stop_after_attempt(settings.DB_RETRY_LIMIT),
-    wait=wait_fixed(settings.DB_RETRY_INTERVAL),
-)
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Create and yield a database session.
     
+    Connections are validated by pool_pre_ping on checkout, so no probe
+    query is issued per request.
+    
     Returns:
         AsyncGenerator: Database session
         
@@ -52,26 +67,68 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     session = AsyncSessionLocal()
     try:
-        # Test connection before yielding - use text() function
-        await session.execute(text("SELECT 1"))
-        logger.debug("Database connection established")
-        
         yield session
     except Exception as e:
-        logger.error(f"Database connection error: {e}")
+        logger.error(f"Database session error: {e}")
         raise
     finally:
         await session.close()
 
 
+def get_session_factory() -> Callable[[], AsyncSession]:
+    """
+    Provide the session factory for work that outlives the request, such as
+    streamed responses, which cannot use the request-scoped get_db session.
+    
+    Returns:
+        Callable[[], AsyncSession]: Factory opening a new database session
+    """
+    return AsyncSessionLocal
+
+
+@retry(
+    stop=stop_after_attempt(settings.DB_RETRY_LIMIT),
+    wait=wait_fixed(settings.DB_RETRY_INTERVAL),
+)
+async def check_database_connection():
+    """
+    Verify the database is reachable, retrying while it starts up.
+    Run once at application startup.
+    """
+    async with engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+    logger.info("Database connection established")
+
+
+async def warm_pool():
+    """
+    Open pool_size connections concurrently so the first requests after
+    startup do not pay connection setup latency.
+    """
+    async def _checkout():
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(_checkout() for _ in range(settings.DB_POOL_SIZE)))
+    logger.info(f"Database pool warmed with {settings.DB_POOL_SIZE} connections")
+
+
 async def create_tables():
     """
     Create all tables defined in the models.
     For development and testing purposes only.
     In production, use Alembic for migrations.
+    
+    Runs under a transaction-scoped advisory lock so that several workers
+    starting at once do not race through table introspection and DDL.
     """
     from app.models.user import User
+    from app.models import models
     async with engine.begin() as conn:
+        await conn.execute(
+            text("SELECT pg_advisory_xact_lock(:lock_id)"),
+            {"lock_id": SCHEMA_LOCK_ID}
+        )
         await conn.run_sync(Base.metadata.create_all)
     logger.info("Database tables created")
 
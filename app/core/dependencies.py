@@ -1,11 +1,6 @@
 # app/core/dependencies.py
 from typing import Generator, Callable, Any
-from functools import lru_cache
-from fastapi import Depends
 
-from sqlalchemy.ext.asyncio import AsyncSession
-
-from app.core.database import get_db
 from app.repositories.product import ProductRepository
 from app.repositories.supplier import SupplierRepository
 from app.repositories.history import PriceHistoryRepository, StockHistoryRepository
@@ -14,71 +9,51 @@ from app.services.supplier import SupplierService
 from app.services.history import HistoryService
 
 
+# Repositories and services hold no per-request state (the session is passed
+# explicitly), so a single instance of each is shared by every request
+_product_repository = ProductRepository()
+_supplier_repository = SupplierRepository()
+_price_history_repository = PriceHistoryRepository()
+_stock_history_repository = StockHistoryRepository()
+
+_product_service = ProductService(
+    product_repository=_product_repository,
+    price_history_repository=_price_history_repository,
+    stock_history_repository=_stock_history_repository
+)
+_supplier_service = SupplierService(supplier_repository=_supplier_repository)
+_history_service = HistoryService(
+    price_history_repository=_price_history_repository,
+    stock_history_repository=_stock_history_repository,
+    product_repository=_product_repository
+)
+
+
 # Repository dependencies
-@lru_cache
 def get_product_repository() -> ProductRepository:
-    return ProductRepository()
+    return _product_repository
 
 
-@lru_cache
 def get_supplier_repository() -> SupplierRepository:
-    return SupplierRepository()
+    return _supplier_repository
 
 
-@lru_cache
 def get_price_history_repository() -> PriceHistoryRepository:
-    return PriceHistoryRepository()
+    return _price_history_repository
 
 
-@lru_cache
 def get_stock_history_repository() -> StockHistoryRepository:
-    return StockHistoryRepository()
+    return _stock_history_repository
 
 
 # Service dependencies
-@lru_cache
-def get_product_service(
-    product_repository: ProductRepository = Depends(get_product_repository),
-    price_history_repository: PriceHistoryRepository = Depends(get_price_history_repository),
-    stock_history_repository: StockHistoryRepository = Depends(get_stock_history_repository)
-) -> ProductService:
-    return ProductService(
-        product_repository=product_repository,
-        price_history_repository=price_history_repository,
-        stock_history_repository=stock_history_repository
-    )
-
-
-@lru_cache
-def get_supplier_service(
-    supplier_repository: SupplierRepository = Depends(get_supplier_repository)
-) -> SupplierService:
-    return SupplierService(supplier_repository=supplier_repository)
-
-
-@lru_cache
-def get_history_service(
-    price_history_repository: PriceHistoryRepository = Depends(get_price_history_repository),
-    stock_history_repository: StockHistoryRepository = Depends(get_stock_history_repository),
-    product_repository: ProductRepository = Depends(get_product_repository)
-) -> HistoryService:
-    return HistoryService(
-        price_history_repository=price_history_repository,
-        stock_history_repository=stock_history_repository,
-        product_repository=product_repository
-    )
-
-
-# Define common dependencies for API endpoints
-class CommonDependencies:
-    def __init__(
-        self,
-        db: AsyncSession = Depends(get_db),
-        product_service: ProductService = Depends(get_product_service),
-        supplier_service: SupplierService = Depends(get_supplier_service),
-        history_service: HistoryService = Depends(get_history_service)
-    ):
-        self.db = db
-        self.product_service = product_service
-        self.supplier_service = supplier_service
-        self.history_service = history_service
\ No newline at end of file
+def get_product_service() -> ProductService:
+    return _product_service
+
+
+def get_supplier_service() -> SupplierService:
+    return _supplier_service
+
+
+def get_history_service() -> HistoryService:
+    return _history_service
@@ -1,19 +1,25 @@
-from ..models.base import Base
-from ..core.database import engine
-from ..models.models import Product, Supplier, PriceStockHistory
+# app/core/init_db.py
+import asyncio
 import logging
 
+from app.core.database import create_tables, engine
+
 logger = logging.getLogger(__name__)
 
-def init_db():
+
+async def init_db():
+    """
+    Create the database schema once, ahead of starting the web workers.
+    """
     try:
-        # Create tables
-        Base.metadata.create_all(bind=engine)
+        await create_tables()
         logger.info("Database tables created successfully")
     except Exception as e:
         logger.error(f"Error initializing database: {e}")
         raise
+    finally:
+        await engine.dispose()
 
-# This ensures tables are created when the application starts
+# Run with "python -m app.core.init_db" before starting the application
 if __name__ == "__main__":
-    init_db()
\ No newline at end of file
+    asyncio.run(init_db())
@@ -0,0 +1,22 @@
+# app/core/pagination.py
+from typing import Optional
+
+
+def total_from_page(skip: int, limit: int, item_count: int) -> Optional[int]:
+    """
+    Return the exact total when a page alone proves it, else None.
+
+    A page shorter than ``limit`` is the last one, so the total is ``skip``
+    plus its length. An empty page only proves that when nothing was skipped,
+    since an offset past the end also comes back empty.
+    """
+    if item_count < limit and (item_count or not skip):
+        return skip + item_count
+    return None
+
+
+def page_count(total: int, page_size: int) -> int:
+    """
+    Number of pages needed to hold ``total`` items.
+    """
+    return (total + page_size - 1) // page_size if page_size > 0 else 1
@@ -0,0 +1,51 @@
+# app/core/seed_db.py
+import asyncio
+import logging
+import sys
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import AsyncSessionLocal, engine
+from app.core.dependencies import get_product_repository
+from app.models.models import Product
+from app.schemas.product import ProductCreate
+
+logger = logging.getLogger(__name__)
+
+_products_adapter = TypeAdapter(List[ProductCreate])
+
+
+async def seed_products(db: AsyncSession, payload: bytes) -> List[Product]:
+    """
+    Validate a JSON array of products and load it in one batch.
+
+    Seed files are not bound by the API's batch size cap, so large ones go
+    through COPY rather than INSERT.
+    """
+    products_in = _products_adapter.validate_json(payload)
+    return await get_product_repository().bulk_copy_create(db, objs_in=products_in)
+
+
+async def seed_db(path: str):
+    """
+    Load the products in a JSON seed file into the database.
+    """
+    with open(path, "rb") as seed_file:
+        payload = seed_file.read()
+    try:
+        async with AsyncSessionLocal() as db:
+            products = await seed_products(db, payload)
+        logger.info(f"Seeded {len(products)} products from {path}")
+    except Exception as e:
+        logger.error(f"Error seeding database: {e}")
+        raise
+    finally:
+        await engine.dispose()
+
+# Run with "python -m app.core.seed_db products.json" after app.core.init_db
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        sys.exit("usage: python -m app.core.seed_db <products.json>")
+    asyncio.run(seed_db(sys.argv[1]))
@@ -1,12 +1,15 @@
 # app/main.py
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
-import requests
+import httpx
 import os
 
 from app.api.v1.router import api_router
-from app.core.database import create_tables
+from app.core.database import check_database_connection, create_tables, engine, warm_pool
+from app.core.responses import ORJSONResponse
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -16,12 +19,55 @@ logger = logging.getLogger(__name__)
 API_V1_STR = "/api/v1"
 PROJECT_NAME = "Product Service API"
 
+# Service registration settings
+SERVICE_NAME = os.getenv("SERVICE_NAME", "product-service")
+SERVICE_HOST = os.getenv("SERVICE_HOST", "localhost")
+SERVICE_PORT = os.getenv("SERVICE_PORT", "8000")
+GATEWAY_URL = os.getenv("GATEWAY_URL", "http://api-gateway:8080")
+
+# Strong references to fire-and-forget startup tasks so they are not garbage collected
+_background_tasks = set()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifespan: startup work before the yield, shutdown after it.
+    """
+    logger.info("Starting up application...")
+    
+    # Probe the database once here instead of on every request
+    await check_database_connection()
+    await warm_pool()
+    
+    # Create database tables for development/testing only; deployments run
+    # "python -m app.core.init_db" (or Alembic) once before the workers start
+    if os.getenv("ENVIRONMENT", "development") == "development":
+        await create_tables()
+    
+    # Register service with API gateway if gateway URL is provided,
+    # in the background so startup does not wait on the gateway
+    if GATEWAY_URL != "http://api-gateway:8080":
+        task = asyncio.create_task(register_service())
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+    
+    yield
+    
+    logger.info("Shutting down application...")
+    # Close pooled connections cleanly
+    await engine.dispose()
+
+
 # Create FastAPI application
 app = FastAPI(
     title=PROJECT_NAME,
     openapi_url=f"{API_V1_STR}/openapi.json",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
+    # Render every response body with orjson, not only the endpoints that return one directly
+    default_response_class=ORJSONResponse,
 )
 
 # Add CORS middleware
@@ -36,31 +82,6 @@ app.add_middleware(
 # Include API router
 app.include_router(api_router, prefix=API_V1_STR)
 
-# Service registration settings
-SERVICE_NAME = os.getenv("SERVICE_NAME", "product-service")
-SERVICE_HOST = os.getenv("SERVICE_HOST", "localhost")
-SERVICE_PORT = os.getenv("SERVICE_PORT", "8000")
-GATEWAY_URL = os.getenv("GATEWAY_URL", "http://api-gateway:8080")
-
-
-@app.on_event("startup")
-async def startup_event():
-    """
-    Application startup event.
-    """
-    logger.info("Starting up application...")
-    
-    # Create database tables for development/testing
-    # In production, use Alembic for migrations
-    if os.getenv("ENVIRONMENT", "development") == "development":
-        await create_tables()
-        logger.info("Database tables created")
-    
-    # Register service with API gateway if gateway URL is provided
-    if GATEWAY_URL != "http://api-gateway:8080":
-        await register_service()
-
-
 async def register_service():
     """
     Register service with API gateway.
@@ -78,7 +99,8 @@ async def register_service():
         ]
     }
     try:
-        response = requests.post(f"{GATEWAY_URL}/register", json=service_data)
+        async with httpx.AsyncClient(timeout=5.0) as client:
+            response = await client.post(f"{GATEWAY_URL}/register", json=service_data)
         if response.status_code == 200:
             logger.info(f"Service registered successfully: {response.json()}")
         else:
@@ -95,7 +117,6 @@ async def health_check():
     # Check database connection
     try:
         from sqlalchemy import text
-        from app.core.database import engine
         async with engine.connect() as connection:
             await connection.execute(text("SELECT 1"))
         return {
@@ -114,4 +135,11 @@ async def health_check():
 # If running directly with "python app/main.py"
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+    )
\ No newline at end of file
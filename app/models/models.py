@@ -1,8 +1,9 @@
 # app/models/models.py
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Text, Table
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from typing import List, Optional
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Text, Table, Index, DDL, Computed, event, func
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
 
@@ -18,62 +19,151 @@ class Product(Base):
     """Product model."""
     __tablename__ = "products"
 
-    id = Column(Integer, primary_key=True, index=True)
-    name = Column(String(100), nullable=False, index=True)
-    price = Column(Float, nullable=False)
-    description = Column(Text, nullable=True)
-    stock_quantity = Column(Integer, nullable=False, default=0)
-    category = Column(String(50), nullable=True, index=True)
-    discount = Column(Float, nullable=False, default=0)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    name: Mapped[str] = mapped_column(String(100), index=True)
+    price: Mapped[float] = mapped_column(Float)
+    description: Mapped[Optional[str]] = mapped_column(Text)
+    stock_quantity: Mapped[int] = mapped_column(default=0)
+    category: Mapped[Optional[str]] = mapped_column(String(50), index=True)
+    discount: Mapped[float] = mapped_column(Float, default=0)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
-    suppliers = relationship("Supplier", secondary="product_suppliers", lazy="selectin")
+    suppliers: Mapped[List["Supplier"]] = relationship(secondary="product_suppliers", lazy="selectin")
 
-    price_history = relationship("PriceHistory", back_populates="product", cascade="all, delete-orphan")
-    stock_history = relationship("StockHistory", back_populates="product", cascade="all, delete-orphan")
+    price_history: Mapped[List["PriceHistory"]] = relationship(back_populates="product", cascade="all, delete-orphan")
+    stock_history: Mapped[List["StockHistory"]] = relationship(back_populates="product", cascade="all, delete-orphan")
+
+
+# Trigram indexes on lower() back the case-insensitive substring product search
+Index(
+    "products_name_trgm",
+    func.lower(Product.name),
+    postgresql_using="gin",
+    postgresql_ops={"lower_1": "gin_trgm_ops"},
+)
+Index(
+    "products_desc_trgm",
+    func.lower(Product.description),
+    postgresql_using="gin",
+    postgresql_ops={"lower_1": "gin_trgm_ops"},
+)
+# Lets case-insensitive prefix searches (lower(name) LIKE 'term%') use a
+# B-tree regardless of collation
+Index(
+    "products_name_pattern",
+    func.lower(Product.name),
+    postgresql_ops={"lower_1": "text_pattern_ops"},
+)
 
 
 class Supplier(Base):
     """Supplier model."""
     __tablename__ = "suppliers"
 
-    id = Column(Integer, primary_key=True, index=True)
-    name = Column(String(100), nullable=False, index=True)
-    contact_info = Column(Text, nullable=False)
-    credit_rating = Column(Integer, nullable=False, default=0)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    name: Mapped[str] = mapped_column(String(100), index=True)
+    contact_info: Mapped[str] = mapped_column(Text)
+    credit_rating: Mapped[int] = mapped_column(default=0)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Full-text search document, maintained by PostgreSQL and never loaded by default
+    search_tsv: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(contact_info, ''))",
+            persisted=True,
+        ),
+        deferred=True,
+    )
+    # Lowercased name and contact info for substring search; the newline keeps
+    # a term from matching across the boundary between the two fields
+    search_text: Mapped[Optional[str]] = mapped_column(
+        Text,
+        Computed(
+            "lower(coalesce(name, '') || E'\\n' || coalesce(contact_info, ''))",
+            persisted=True,
+        ),
+        deferred=True,
+    )
 
     # Relationships
-    products = relationship("Product", secondary=ProductSupplier, back_populates="suppliers")
+    products: Mapped[List["Product"]] = relationship(secondary=ProductSupplier, back_populates="suppliers")
+
+    __table_args__ = (
+        # One trigram index over search_text serves substring searches of both fields
+        Index(
+            "ix_suppliers_search_text_trgm",
+            "search_text",
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        ),
+        Index("ix_suppliers_search_tsv", "search_tsv", postgresql_using="gin"),
+        # Serves the top-rated ranking and its keyset pages without a sort
+        Index("ix_suppliers_credit_rating_id", "credit_rating", "id"),
+    )
+
+
+# Lets case-insensitive prefix searches (lower(name) LIKE 'term%') use a
+# B-tree regardless of collation
+Index(
+    "ix_suppliers_name_pattern",
+    func.lower(Supplier.name),
+    postgresql_ops={"lower_1": "text_pattern_ops"},
+)
+
+
+# The trigram operator classes used by the product and supplier indexes come
+# from the pg_trgm extension, which must exist before either table is created
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"),
+)
 
 
 class PriceHistory(Base):
     """Price history model for tracking price changes."""
     __tablename__ = "price_history"
 
-    id = Column(Integer, primary_key=True, index=True)
-    product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
-    old_price = Column(Float, nullable=False)
-    new_price = Column(Float, nullable=False)
-    timestamp = Column(DateTime, default=datetime.utcnow, index=True)
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    product_id: Mapped[int] = mapped_column(ForeignKey("products.id"))
+    old_price: Mapped[float] = mapped_column(Float)
+    new_price: Mapped[float] = mapped_column(Float)
+    timestamp: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow, index=True)
 
     # Relationships
-    product = relationship("Product", back_populates="price_history")
+    product: Mapped["Product"] = relationship(back_populates="price_history")
 
 
 class StockHistory(Base):
     """Stock history model for tracking stock quantity changes."""
     __tablename__ = "stock_history"
 
-    id = Column(Integer, primary_key=True, index=True)
-    product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
-    old_quantity = Column(Integer, nullable=False)
-    new_quantity = Column(Integer, nullable=False)
-    change_reason = Column(Text, nullable=True)
-    timestamp = Column(DateTime, default=datetime.utcnow, index=True)
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    product_id: Mapped[int] = mapped_column(ForeignKey("products.id"))
+    old_quantity: Mapped[int] = mapped_column()
+    new_quantity: Mapped[int] = mapped_column()
+    change_reason: Mapped[Optional[str]] = mapped_column(Text)
+    timestamp: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow, index=True)
 
     # Relationships
-    product = relationship("Product", back_populates="stock_history")
\ No newline at end of file
+    product: Mapped["Product"] = relationship(back_populates="stock_history")
+
+
+# Serve "latest first" history pages and their keyset cursors from one index scan.
+# Price history rows are small enough to carry in full, allowing index-only scans.
+Index(
+    "ix_price_history_product_timestamp_id",
+    PriceHistory.product_id,
+    PriceHistory.timestamp.desc(),
+    PriceHistory.id.desc(),
+    postgresql_include=["old_price", "new_price"],
+)
+Index(
+    "ix_stock_history_product_timestamp_id",
+    StockHistory.product_id,
+    StockHistory.timestamp.desc(),
+    StockHistory.id.desc(),
+)
@@ -1,6 +1,8 @@
 # app/models/user.py
 from datetime import datetime
-from sqlalchemy import Boolean, Column, DateTime, Integer, String
+from typing import Optional
+from sqlalchemy import DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
 from pydantic import BaseModel, EmailStr, Field
 
 from app.core.database import Base
@@ -10,14 +12,14 @@ class User(Base):
     """User database model."""
     __tablename__ = "users"
 
-    id = Column(Integer, primary_key=True, index=True)
-    username = Column(String, unique=True, index=True)
-    email = Column(String, unique=True, index=True)
-    hashed_password = Column(String)
-    full_name = Column(String)
-    is_active = Column(Boolean, default=True)
-    is_admin = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    username: Mapped[Optional[str]] = mapped_column(String, unique=True, index=True)
+    email: Mapped[Optional[str]] = mapped_column(String, unique=True, index=True)
+    hashed_password: Mapped[Optional[str]] = mapped_column(String)
+    full_name: Mapped[Optional[str]] = mapped_column(String)
+    is_active: Mapped[Optional[bool]] = mapped_column(default=True)
+    is_admin: Mapped[Optional[bool]] = mapped_column(default=False)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow)
 
 
 # Pydantic models for request/response validation
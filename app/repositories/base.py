@@ -1,8 +1,7 @@
 # app/repositories/base.py
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
-from fastapi.encoders import jsonable_encoder
-from pydantic import BaseModel
-from sqlalchemy import func, select, desc, asc, or_, and_
+from typing import Any, AsyncIterator, Dict, Generic, List, Optional, Tuple, Type, TypeVar, Union
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import func, select, insert, update, delete, desc, asc, or_, and_, text, Select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -13,6 +12,26 @@ ModelType = TypeVar("ModelType")
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+# Below this many rows the planner estimate is unreliable and an exact count is cheap
+COUNT_ESTIMATE_MIN_ROWS = 10000
+
+# Rows fetched per round trip when iterating over a full result set
+ITER_YIELD_PER = 1000
+
+# List[schema] adapters, built once per schema class and shared by all repositories
+_list_adapters: Dict[type, TypeAdapter] = {}
+
+# Committed-write counters per table, shared by all repositories so a cache
+# can key on the tables it reads even when another repository writes them
+_write_versions: Dict[str, int] = {}
+
+
+def write_version(*tables: str) -> Tuple[int, ...]:
+    """
+    Return the current write counters for the given tables.
+    """
+    return tuple(_write_versions.get(table, 0) for table in tables)
+
 
 class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """
@@ -24,6 +43,31 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         Initialize repository with the SQLAlchemy model class
         """
         self.model = model
+        # Filterable columns, resolved once so filter dispatch is a set/dict lookup
+        self._columns = frozenset(model.__table__.columns.keys())
+        self._col_attrs = {key: getattr(model, key) for key in self._columns}
+
+    @staticmethod
+    def _dump_rows(objs_in: List[BaseModel], **kwargs) -> List[Dict[str, Any]]:
+        """
+        Dump a homogeneous list of schemas to dicts in a single pydantic-core call.
+        """
+        if not objs_in:
+            return []
+        schema = type(objs_in[0])
+        adapter = _list_adapters.get(schema)
+        if adapter is None:
+            adapter = _list_adapters[schema] = TypeAdapter(List[schema])
+        return adapter.dump_python(objs_in, **kwargs)
+
+    def _on_write(self) -> None:
+        """
+        Hook called after every committed write.
+        
+        Bumps the table's write counter; subclasses that cache reads extend it.
+        """
+        table = self.model.__tablename__
+        _write_versions[table] = _write_versions.get(table, 0) + 1
 
     async def get(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
         """
@@ -34,18 +78,15 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             raise NotFoundException(f"{self.model.__name__} with id {id} not found")
         return result
 
-    async def get_multi(
-        self, 
-        db: AsyncSession, 
-        *, 
-        skip: int = 0, 
-        limit: int = 100,
+    def _build_multi_query(
+        self,
+        *,
         sort_by: Optional[str] = None,
         sort_order: Optional[str] = "asc",
         **filters
-    ) -> List[ModelType]:
+    ) -> Select:
         """
-        Get multiple records with pagination, sorting and filtering.
+        Build the unpaginated query for get_multi's filters and sorting.
         """
         query = select(self.model)
         
@@ -53,29 +94,47 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         if filters:
             filter_conditions = []
             for key, value in filters.items():
-                if hasattr(self.model, key):
+                if key in self._columns:
+                    column = self._col_attrs[key]
                     if isinstance(value, dict):
                         # Handle range filters (min/max)
                         if "min" in value and value["min"] is not None:
-                            filter_conditions.append(getattr(self.model, key) >= value["min"])
+                            filter_conditions.append(column >= value["min"])
                         if "max" in value and value["max"] is not None:
-                            filter_conditions.append(getattr(self.model, key) <= value["max"])
+                            filter_conditions.append(column <= value["max"])
                     elif isinstance(value, list):
                         # Handle list of values (IN operator)
-                        filter_conditions.append(getattr(self.model, key).in_(value))
+                        filter_conditions.append(column.in_(value))
                     elif value is not None:
                         # Handle exact match
-                        filter_conditions.append(getattr(self.model, key) == value)
+                        filter_conditions.append(column == value)
             
             if filter_conditions:
                 query = query.where(and_(*filter_conditions))
         
         # Apply sorting
-        if sort_by and hasattr(self.model, sort_by):
+        if sort_by in self._columns:
             if sort_order.lower() == "desc":
-                query = query.order_by(desc(getattr(self.model, sort_by)))
+                query = query.order_by(desc(self._col_attrs[sort_by]))
             else:
-                query = query.order_by(asc(getattr(self.model, sort_by)))
+                query = query.order_by(asc(self._col_attrs[sort_by]))
+        
+        return query
+
+    async def get_multi(
+        self, 
+        db: AsyncSession, 
+        *, 
+        skip: int = 0, 
+        limit: int = 100,
+        sort_by: Optional[str] = None,
+        sort_order: Optional[str] = "asc",
+        **filters
+    ) -> List[ModelType]:
+        """
+        Get multiple records with pagination, sorting and filtering.
+        """
+        query = self._build_multi_query(sort_by=sort_by, sort_order=sort_order, **filters)
                 
         # Apply pagination
         query = query.offset(skip).limit(limit)
@@ -83,6 +142,26 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         result = await db.execute(query)
         return result.scalars().all()
 
+    async def iter_multi(
+        self,
+        db: AsyncSession,
+        *,
+        sort_by: Optional[str] = None,
+        sort_order: Optional[str] = "asc",
+        yield_per: int = ITER_YIELD_PER,
+        **filters
+    ) -> AsyncIterator[ModelType]:
+        """
+        Iterate over every record matching get_multi's filters and sorting.
+        
+        Rows come through a server-side cursor ``yield_per`` at a time, so
+        memory stays bounded for exports of any size.
+        """
+        query = self._build_multi_query(sort_by=sort_by, sort_order=sort_order, **filters)
+        result = await db.stream_scalars(query.execution_options(yield_per=yield_per))
+        async for row in result:
+            yield row
+
     async def search(
         self,
         db: AsyncSession,
@@ -99,12 +178,22 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         if not search_term or not search_fields:
             return await self.get_multi(db, skip=skip, limit=limit, **kwargs)
         
+        # A trailing "*" asks for a case-insensitive prefix match, which a
+        # lower(column) text_pattern_ops B-tree can serve
+        prefix = search_term[:-1] if search_term.endswith("*") else None
+        
         search_conditions = []
         for field in search_fields:
-            if hasattr(self.model, field):
-                search_conditions.append(
-                    getattr(self.model, field).ilike(f"%{search_term}%")
-                )
+            if field in self._columns:
+                column = self._col_attrs[field]
+                if prefix is not None:
+                    search_conditions.append(
+                        func.lower(column).startswith(prefix.lower(), autoescape=True)
+                    )
+                else:
+                    search_conditions.append(
+                        func.lower(column).like(func.lower(f"%{search_term}%"))
+                    )
         
         query = select(self.model).where(or_(*search_conditions))
         
@@ -112,8 +201,8 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         if kwargs:
             filter_conditions = []
             for key, value in kwargs.items():
-                if hasattr(self.model, key) and value is not None:
-                    filter_conditions.append(getattr(self.model, key) == value)
+                if key in self._columns and value is not None:
+                    filter_conditions.append(self._col_attrs[key] == value)
             
             if filter_conditions:
                 query = query.where(and_(*filter_conditions))
@@ -124,34 +213,37 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         result = await db.execute(query)
         return result.scalars().all()
 
-    async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
+    async def create(self, db: AsyncSession, *, obj_in: Union[CreateSchemaType, Dict[str, Any]]) -> ModelType:
         """
         Create a new record.
         """
-        obj_in_data = jsonable_encoder(obj_in)
+        obj_in_data = obj_in if isinstance(obj_in, dict) else obj_in.model_dump(exclude_unset=True)
         db_obj = self.model(**obj_in_data)
         db.add(db_obj)
         await db.commit()
+        self._on_write()
         await db.refresh(db_obj)
         return db_obj
 
     async def batch_create(self, db: AsyncSession, *, objs_in: List[CreateSchemaType]) -> List[ModelType]:
         """
         Create multiple records in a batch.
+        
+        Rows go out as one INSERT ... RETURNING (paged by insertmanyvalues),
+        so the created objects come back fully populated without a refresh each.
         """
-        db_objs = []
-        for obj_in in objs_in:
-            obj_in_data = jsonable_encoder(obj_in)
-            db_obj = self.model(**obj_in_data)
-            db.add(db_obj)
-            db_objs.append(db_obj)
+        if not objs_in:
+            return []
         
+        result = await db.scalars(
+            insert(self.model).returning(self.model),
+            # Full dumps keep every row on the same key set, so insertmanyvalues
+            # can send them in shared multi-row batches
+            self._dump_rows(objs_in)
+        )
+        db_objs = result.all()
         await db.commit()
-        
-        # Refresh all objects
-        for db_obj in db_objs:
-            await db.refresh(db_obj)
-        
+        self._on_write()
         return db_objs
 
     async def update(
@@ -164,19 +256,18 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         Update a record.
         """
-        obj_data = jsonable_encoder(db_obj)
-        
         if isinstance(obj_in, dict):
             update_data = obj_in
         else:
-            update_data = obj_in.dict(exclude_unset=True)
+            update_data = obj_in.model_dump(exclude_unset=True)
             
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
+        for field, value in update_data.items():
+            if field in self._columns:
+                setattr(db_obj, field, value)
                 
         db.add(db_obj)
         await db.commit()
+        self._on_write()
         await db.refresh(db_obj)
         return db_obj
 
@@ -189,40 +280,34 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     ) -> List[ModelType]:
         """
         Update multiple records by their IDs.
+        
+        The same changes are applied to every record with a single
+        UPDATE ... RETURNING, which also yields the updated objects.
         """
         if not ids:
             return []
             
-        # Get all objects to update
-        query = select(self.model).where(self.model.id.in_(ids))
-        result = await db.execute(query)
-        db_objs = result.scalars().all()
-        
-        if not db_objs:
-            return []
-            
         # Convert input to dict if it's a Pydantic model
         if isinstance(obj_in, dict):
             update_data = obj_in
         else:
-            update_data = obj_in.dict(exclude_unset=True)
-            
-        # Update each object
-        updated_objs = []
-        for db_obj in db_objs:
-            for field, value in update_data.items():
-                if hasattr(db_obj, field):
-                    setattr(db_obj, field, value)
-                    
-            db.add(db_obj)
-            updated_objs.append(db_obj)
-            
-        await db.commit()
+            update_data = obj_in.model_dump(exclude_unset=True)
         
-        # Refresh all objects
-        for db_obj in updated_objs:
-            await db.refresh(db_obj)
-            
+        values = {field: value for field, value in update_data.items() if field in self._columns}
+        if not values:
+            query = select(self.model).where(self.model.id.in_(ids))
+            result = await db.execute(query)
+            return result.scalars().all()
+        
+        result = await db.scalars(
+            update(self.model)
+            .where(self.model.id.in_(ids))
+            .values(**values)
+            .returning(self.model)
+        )
+        updated_objs = result.all()
+        await db.commit()
+        self._on_write()
         return updated_objs
 
     async def delete(self, db: AsyncSession, *, id: Any) -> ModelType:
@@ -232,28 +317,30 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         obj = await self.get(db, id)
         await db.delete(obj)
         await db.commit()
+        self._on_write()
         return obj
 
     async def batch_delete(self, db: AsyncSession, *, ids: List[Any]) -> List[ModelType]:
         """
         Delete multiple records by their IDs.
+        
+        A single DELETE ... RETURNING removes the rows and hands back their
+        final state; IDs that do not exist are skipped. ORM cascades do not
+        run, so subclasses whose rows are referenced elsewhere must clear
+        those references first.
         """
         if not ids:
             return []
-            
-        # Get all objects to delete
-        query = select(self.model).where(self.model.id.in_(ids))
-        result = await db.execute(query)
-        db_objs = result.scalars().all()
         
-        if not db_objs:
-            return []
-            
-        # Delete each object
-        for db_obj in db_objs:
-            await db.delete(db_obj)
-            
+        result = await db.scalars(
+            delete(self.model)
+            .where(self.model.id.in_(ids))
+            .returning(self.model)
+            .execution_options(synchronize_session=False)
+        )
+        db_objs = result.all()
         await db.commit()
+        self._on_write()
         return db_objs
 
     async def count(self, db: AsyncSession, **filters) -> int:
@@ -266,11 +353,26 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         if filters:
             filter_conditions = []
             for key, value in filters.items():
-                if hasattr(self.model, key) and value is not None:
-                    filter_conditions.append(getattr(self.model, key) == value)
+                if key in self._columns and value is not None:
+                    filter_conditions.append(self._col_attrs[key] == value)
             
             if filter_conditions:
                 query = query.where(and_(*filter_conditions))
                 
         result = await db.execute(query)
-        return result.scalar_one()
\ No newline at end of file
+        return result.scalar_one()
+
+    async def count_estimate(self, db: AsyncSession) -> int:
+        """
+        Estimate the total number of records from PostgreSQL planner statistics.
+        
+        Falls back to an exact count for small or never-analyzed tables.
+        """
+        result = await db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE relname = :table_name"),
+            {"table_name": self.model.__tablename__}
+        )
+        estimate = result.scalar_one_or_none()
+        if estimate is None or estimate < COUNT_ESTIMATE_MIN_ROWS:
+            return await self.count(db)
+        return estimate
@@ -1,13 +1,209 @@
 # app/repositories/history.py
 from datetime import datetime
-from typing import Any, List, Optional, Union
-from sqlalchemy import select, and_, between
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+from sqlalchemy import Float, Integer, Text, Select, insert, select, and_, between, cast, func, lambda_stmt, literal, null, true, tuple_, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 
-from app.models.models import PriceHistory, StockHistory
+from app.models.models import PriceHistory, Product, StockHistory
 from app.schemas.history import PriceHistoryCreate, StockHistoryCreate
 from app.repositories.base import BaseRepository
 
+# Rows fetched per round trip when streaming history pages
+HISTORY_YIELD_PER = 100
+
+# Keyset pagination position: the (timestamp, id) of the last row already seen
+HistoryCursor = Tuple[datetime, int]
+
+
+def _date_range_conditions(model, start_date: Optional[datetime], end_date: Optional[datetime]) -> list:
+    """
+    Build timestamp conditions for an optional date range.
+    """
+    if start_date and end_date:
+        return [between(model.timestamp, start_date, end_date)]
+    if start_date:
+        return [model.timestamp >= start_date]
+    if end_date:
+        return [model.timestamp <= end_date]
+    return []
+
+
+async def _iter_dicts(db: AsyncSession, stmt: Union[Select, StatementLambdaElement]) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Execute a Core history query through a server-side cursor, yielding plain row dicts.
+    """
+    result = await db.stream(stmt.execution_options(yield_per=HISTORY_YIELD_PER))
+    async for row in result.mappings():
+        yield dict(row)
+
+
+async def _stream_dicts(db: AsyncSession, stmt: Union[Select, StatementLambdaElement]) -> List[Dict[str, Any]]:
+    """
+    Execute a Core history query through a server-side cursor and return plain row dicts.
+    """
+    return [row async for row in _iter_dicts(db, stmt)]
+
+
+def _iter_by_date_range(
+    db: AsyncSession,
+    model,
+    *,
+    product_id: int,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Iterate over a product's history records, latest first, optionally within a date range.
+    """
+    query = select(model.__table__).where(
+        model.product_id == product_id,
+        *_date_range_conditions(model, start_date, end_date)
+    ).order_by(model.timestamp.desc(), model.id.desc())
+    return _iter_dicts(db, query)
+
+
+async def _get_page_with_total(
+    db: AsyncSession,
+    model,
+    *,
+    product_id: int,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[HistoryCursor] = None
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Get a page of history records and the total number of the product's
+    records in the date range, in one query.
+    
+    The page and the count are CTEs joined as ``cnt LEFT JOIN page ON true``,
+    so a single row still carries the total when the page is empty. Records
+    are selected from the table rather than the mapped class and come back
+    as plain dicts, since read-only listings gain nothing from ORM identity
+    tracking.
+    
+    With a ``cursor`` the page starts right after that (timestamp, id)
+    position and ``skip`` is ignored, so deep pages cost an index seek
+    instead of scanning and discarding ``skip`` rows.
+    """
+    conditions = [model.product_id == product_id, *_date_range_conditions(model, start_date, end_date)]
+    if cursor:
+        conditions.append(tuple_(model.timestamp, model.id) < tuple_(*cursor))
+    
+    page = select(model.__table__).where(
+        and_(*conditions)
+    ).order_by(
+        model.timestamp.desc(), model.id.desc()
+    )
+    page = (page if cursor else page.offset(skip)).limit(limit).cte("page")
+    
+    # The total covers the same date range as the page, but not the cursor
+    count = select(func.count().label("total")).select_from(model).where(
+        model.product_id == product_id,
+        *_date_range_conditions(model, start_date, end_date)
+    ).cte("cnt")
+    
+    query = select(count.c.total, page).select_from(count).outerjoin(
+        page, true()
+    ).order_by(page.c.timestamp.desc(), page.c.id.desc())
+    
+    total = 0
+    items = []
+    for row in await _stream_dicts(db, query):
+        total = row.pop("total")
+        if row["id"] is not None:
+            items.append(row)
+    return items, total
+
+
+async def get_combined_history(
+    db: AsyncSession,
+    *,
+    product_id: int,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    skip: int = 0,
+    limit: int = 100
+) -> Optional[Tuple[str, List[Dict[str, Any]], List[Dict[str, Any]]]]:
+    """
+    Get a product's name with a page each of its price and stock history in one query.
+    
+    Both pages are tagged with a ``kind`` column and combined with UNION ALL,
+    then hung off the product row as ``product LEFT JOIN history ON true``,
+    so a product without history still returns its name. Each page keeps
+    its own offset and limit. Returns None if the product does not exist.
+    """
+    price_page = select(PriceHistory).where(
+        PriceHistory.product_id == product_id,
+        *_date_range_conditions(PriceHistory, start_date, end_date)
+    ).order_by(
+        PriceHistory.timestamp.desc(), PriceHistory.id.desc()
+    ).offset(skip).limit(limit).subquery()
+    stock_page = select(StockHistory).where(
+        StockHistory.product_id == product_id,
+        *_date_range_conditions(StockHistory, start_date, end_date)
+    ).order_by(
+        StockHistory.timestamp.desc(), StockHistory.id.desc()
+    ).offset(skip).limit(limit).subquery()
+    
+    history = union_all(
+        select(
+            literal("price").label("kind"),
+            price_page.c.id,
+            price_page.c.timestamp,
+            price_page.c.old_price,
+            price_page.c.new_price,
+            cast(null(), Integer).label("old_quantity"),
+            cast(null(), Integer).label("new_quantity"),
+            cast(null(), Text).label("change_reason"),
+        ),
+        select(
+            literal("stock").label("kind"),
+            stock_page.c.id,
+            stock_page.c.timestamp,
+            cast(null(), Float).label("old_price"),
+            cast(null(), Float).label("new_price"),
+            stock_page.c.old_quantity,
+            stock_page.c.new_quantity,
+            stock_page.c.change_reason,
+        ),
+    ).cte("history")
+    
+    query = select(Product.name, history).select_from(Product).outerjoin(
+        history, true()
+    ).where(
+        Product.id == product_id
+    ).order_by(history.c.timestamp.desc(), history.c.id.desc())
+    
+    result = await db.execute(query)
+    rows = result.all()
+    if not rows:
+        return None
+    
+    price_history = []
+    stock_history = []
+    for row in rows:
+        if row.kind == "price":
+            price_history.append({
+                "id": row.id,
+                "product_id": product_id,
+                "old_price": row.old_price,
+                "new_price": row.new_price,
+                "timestamp": row.timestamp,
+            })
+        elif row.kind == "stock":
+            stock_history.append({
+                "id": row.id,
+                "product_id": product_id,
+                "old_quantity": row.old_quantity,
+                "new_quantity": row.new_quantity,
+                "change_reason": row.change_reason,
+                "timestamp": row.timestamp,
+            })
+    return rows[0].name, price_history, stock_history
+
 
 class PriceHistoryRepository(BaseRepository[PriceHistory, PriceHistoryCreate, PriceHistoryCreate]):
     """
@@ -23,19 +219,51 @@ class PriceHistoryRepository(BaseRepository[PriceHistory, PriceHistoryCreate, Pr
         *, 
         product_id: int,
         skip: int = 0,
-        limit: int = 100
-    ) -> List[PriceHistory]:
+        limit: int = 100,
+        cursor: Optional[HistoryCursor] = None
+    ) -> List[Dict[str, Any]]:
         """
-        Get price history records for a specific product.
+        Get price history records for a specific product, as plain dicts.
+        
+        A ``cursor`` resumes after the given (timestamp, id) instead of skipping rows.
         """
-        query = select(PriceHistory).where(
-            PriceHistory.product_id == product_id
-        ).order_by(
-            PriceHistory.timestamp.desc()
-        ).offset(skip).limit(limit)
+        stmt = lambda_stmt(lambda: select(PriceHistory.__table__).where(PriceHistory.product_id == product_id))
+        stmt += lambda s: s.order_by(PriceHistory.timestamp.desc(), PriceHistory.id.desc())
+        if cursor:
+            cursor_timestamp, cursor_id = cursor
+            stmt += lambda s: s.where(
+                tuple_(PriceHistory.timestamp, PriceHistory.id) < tuple_(cursor_timestamp, cursor_id)
+            ).limit(limit)
+        else:
+            stmt += lambda s: s.offset(skip).limit(limit)
         
-        result = await db.execute(query)
-        return result.scalars().all()
+        return await _stream_dicts(db, stmt)
+    
+    async def get_page_with_total(
+        self, 
+        db: AsyncSession, 
+        *, 
+        product_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[HistoryCursor] = None
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Get a page of price history records, optionally within a date range,
+        together with the product's total price history count.
+        """
+        return await _get_page_with_total(
+            db,
+            PriceHistory,
+            product_id=product_id,
+            start_date=start_date,
+            end_date=end_date,
+            skip=skip,
+            limit=limit,
+            cursor=cursor
+        )
     
     async def get_by_date_range(
         self, 
@@ -46,27 +274,38 @@ class PriceHistoryRepository(BaseRepository[PriceHistory, PriceHistoryCreate, Pr
         end_date: Optional[datetime] = None,
         skip: int = 0,
         limit: int = 100
-    ) -> List[PriceHistory]:
+    ) -> List[Dict[str, Any]]:
         """
-        Get price history records for a specific product within a date range.
+        Get price history records for a specific product within a date range, as plain dicts.
         """
-        conditions = [PriceHistory.product_id == product_id]
-        
-        if start_date and end_date:
-            conditions.append(between(PriceHistory.timestamp, start_date, end_date))
-        elif start_date:
-            conditions.append(PriceHistory.timestamp >= start_date)
-        elif end_date:
-            conditions.append(PriceHistory.timestamp <= end_date)
-        
-        query = select(PriceHistory).where(
-            and_(*conditions)
-        ).order_by(
-            PriceHistory.timestamp.desc()
-        ).offset(skip).limit(limit)
+        stmt = lambda_stmt(lambda: select(PriceHistory.__table__).where(PriceHistory.product_id == product_id))
+        if start_date:
+            stmt += lambda s: s.where(PriceHistory.timestamp >= start_date)
+        if end_date:
+            stmt += lambda s: s.where(PriceHistory.timestamp <= end_date)
+        stmt += lambda s: s.order_by(PriceHistory.timestamp.desc(), PriceHistory.id.desc()).offset(skip).limit(limit)
         
-        result = await db.execute(query)
-        return result.scalars().all()
+        return await _stream_dicts(db, stmt)
+    
+    def iter_by_date_range(
+        self,
+        db: AsyncSession,
+        *,
+        product_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over every price history record for a product, optionally within
+        a date range, holding only HISTORY_YIELD_PER rows in memory at a time.
+        """
+        return _iter_by_date_range(
+            db,
+            PriceHistory,
+            product_id=product_id,
+            start_date=start_date,
+            end_date=end_date
+        )
     
     async def add_price_change(
         self, 
@@ -74,21 +313,61 @@ class PriceHistoryRepository(BaseRepository[PriceHistory, PriceHistoryCreate, Pr
         *, 
         product_id: int,
         old_price: float,
-        new_price: float
+        new_price: float,
+        commit: bool = True
     ) -> PriceHistory:
         """
         Add a new price change record.
+        
+        With ``commit=False`` the record is written in the caller's
+        transaction and committed together with the change it tracks.
         """
-        price_history = PriceHistory(
+        price_changes = await self.add_price_changes_bulk(
+            db,
+            rows=[{"product_id": product_id, "old_price": old_price, "new_price": new_price}],
+            commit=commit
+        )
+        return price_changes[0]
+    
+    def build_price_change(self, *, product_id: int, old_price: float, new_price: float) -> PriceHistory:
+        """
+        Build an unsaved price change record.
+        
+        Adding it to the session lets it be flushed along with the product
+        update it tracks, instead of costing an INSERT round trip of its own.
+        """
+        return PriceHistory(
             product_id=product_id,
             old_price=old_price,
             new_price=new_price,
             timestamp=datetime.utcnow()
         )
-        db.add(price_history)
-        await db.commit()
-        await db.refresh(price_history)
-        return price_history
+    
+    async def add_price_changes_bulk(
+        self,
+        db: AsyncSession,
+        *,
+        rows: List[Dict[str, Any]],
+        commit: bool = True
+    ) -> List[PriceHistory]:
+        """
+        Add several price change records with a single INSERT ... RETURNING.
+        
+        Each row holds product_id, old_price and new_price; the timestamp is
+        stamped here and the generated ids come back without a refresh.
+        """
+        if not rows:
+            return []
+        
+        timestamp = datetime.utcnow()
+        result = await db.scalars(
+            insert(PriceHistory).returning(PriceHistory),
+            [{**row, "timestamp": timestamp} for row in rows]
+        )
+        price_changes = result.all()
+        if commit:
+            await db.commit()
+        return price_changes
 
 
 class StockHistoryRepository(BaseRepository[StockHistory, StockHistoryCreate, StockHistoryCreate]):
@@ -105,19 +384,51 @@ class StockHistoryRepository(BaseRepository[StockHistory, StockHistoryCreate, St
         *, 
         product_id: int,
         skip: int = 0,
-        limit: int = 100
-    ) -> List[StockHistory]:
+        limit: int = 100,
+        cursor: Optional[HistoryCursor] = None
+    ) -> List[Dict[str, Any]]:
         """
-        Get stock history records for a specific product.
+        Get stock history records for a specific product, as plain dicts.
+        
+        A ``cursor`` resumes after the given (timestamp, id) instead of skipping rows.
         """
-        query = select(StockHistory).where(
-            StockHistory.product_id == product_id
-        ).order_by(
-            StockHistory.timestamp.desc()
-        ).offset(skip).limit(limit)
+        stmt = lambda_stmt(lambda: select(StockHistory.__table__).where(StockHistory.product_id == product_id))
+        stmt += lambda s: s.order_by(StockHistory.timestamp.desc(), StockHistory.id.desc())
+        if cursor:
+            cursor_timestamp, cursor_id = cursor
+            stmt += lambda s: s.where(
+                tuple_(StockHistory.timestamp, StockHistory.id) < tuple_(cursor_timestamp, cursor_id)
+            ).limit(limit)
+        else:
+            stmt += lambda s: s.offset(skip).limit(limit)
         
-        result = await db.execute(query)
-        return result.scalars().all()
+        return await _stream_dicts(db, stmt)
+    
+    async def get_page_with_total(
+        self, 
+        db: AsyncSession, 
+        *, 
+        product_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[HistoryCursor] = None
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Get a page of stock history records, optionally within a date range,
+        together with the product's total stock history count.
+        """
+        return await _get_page_with_total(
+            db,
+            StockHistory,
+            product_id=product_id,
+            start_date=start_date,
+            end_date=end_date,
+            skip=skip,
+            limit=limit,
+            cursor=cursor
+        )
     
     async def get_by_date_range(
         self, 
@@ -128,27 +439,38 @@ class StockHistoryRepository(BaseRepository[StockHistory, StockHistoryCreate, St
         end_date: Optional[datetime] = None,
         skip: int = 0,
         limit: int = 100
-    ) -> List[StockHistory]:
+    ) -> List[Dict[str, Any]]:
         """
-        Get stock history records for a specific product within a date range.
+        Get stock history records for a specific product within a date range, as plain dicts.
         """
-        conditions = [StockHistory.product_id == product_id]
-        
-        if start_date and end_date:
-            conditions.append(between(StockHistory.timestamp, start_date, end_date))
-        elif start_date:
-            conditions.append(StockHistory.timestamp >= start_date)
-        elif end_date:
-            conditions.append(StockHistory.timestamp <= end_date)
+        stmt = lambda_stmt(lambda: select(StockHistory.__table__).where(StockHistory.product_id == product_id))
+        if start_date:
+            stmt += lambda s: s.where(StockHistory.timestamp >= start_date)
+        if end_date:
+            stmt += lambda s: s.where(StockHistory.timestamp <= end_date)
+        stmt += lambda s: s.order_by(StockHistory.timestamp.desc(), StockHistory.id.desc()).offset(skip).limit(limit)
         
-        query = select(StockHistory).where(
-            and_(*conditions)
-        ).order_by(
-            StockHistory.timestamp.desc()
-        ).offset(skip).limit(limit)
-        
-        result = await db.execute(query)
-        return result.scalars().all()
+        return await _stream_dicts(db, stmt)
+    
+    def iter_by_date_range(
+        self,
+        db: AsyncSession,
+        *,
+        product_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over every stock history record for a product, optionally within
+        a date range, holding only HISTORY_YIELD_PER rows in memory at a time.
+        """
+        return _iter_by_date_range(
+            db,
+            StockHistory,
+            product_id=product_id,
+            start_date=start_date,
+            end_date=end_date
+        )
     
     async def add_stock_change(
         self,
@@ -157,20 +479,72 @@ class StockHistoryRepository(BaseRepository[StockHistory, StockHistoryCreate, St
         product_id: int,
         old_quantity: int,
         new_quantity: int,
-        change_reason: Optional[str] = None
+        change_reason: Optional[str] = None,
+        commit: bool = True
     ) -> StockHistory:
         """
         Add a stock quantity change record.
+        
+        With ``commit=False`` the record is written in the caller's
+        transaction and committed together with the change it tracks.
         """
-        stock_history = StockHistory(
+        stock_changes = await self.add_stock_changes_bulk(
+            db,
+            rows=[{
+                "product_id": product_id,
+                "old_quantity": old_quantity,
+                "new_quantity": new_quantity,
+                "change_reason": change_reason,
+            }],
+            commit=commit
+        )
+        return stock_changes[0]
+    
+    def build_stock_change(
+        self,
+        *,
+        product_id: int,
+        old_quantity: int,
+        new_quantity: int,
+        change_reason: Optional[str] = None
+    ) -> StockHistory:
+        """
+        Build an unsaved stock change record.
+        
+        Adding it to the session lets it be flushed along with the product
+        update it tracks, instead of costing an INSERT round trip of its own.
+        """
+        return StockHistory(
             product_id=product_id,
             old_quantity=old_quantity,
             new_quantity=new_quantity,
-            # change_type="Manual Update",
-            change_reason=change_reason,  # Make sure this gets stored
+            change_reason=change_reason,
             timestamp=datetime.utcnow()
         )
-        db.add(stock_history)
-        await db.commit()
-        await db.refresh(stock_history)
-        return stock_history
\ No newline at end of file
+    
+    async def add_stock_changes_bulk(
+        self,
+        db: AsyncSession,
+        *,
+        rows: List[Dict[str, Any]],
+        commit: bool = True
+    ) -> List[StockHistory]:
+        """
+        Add several stock change records with a single INSERT ... RETURNING.
+        
+        Each row holds product_id, old_quantity, new_quantity and
+        change_reason; the timestamp is stamped here and the generated ids
+        come back without a refresh.
+        """
+        if not rows:
+            return []
+        
+        timestamp = datetime.utcnow()
+        result = await db.scalars(
+            insert(StockHistory).returning(StockHistory),
+            [{**row, "timestamp": timestamp} for row in rows]
+        )
+        stock_changes = result.all()
+        if commit:
+            await db.commit()
+        return stock_changes
\ No newline at end of file
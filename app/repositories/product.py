@@ -1,12 +1,61 @@
 # app/repositories/product.py
-from typing import Any, Dict, List, Optional, Union
-from sqlalchemy import select, and_, or_, func
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Union
+from cachetools import TTLCache
+from sqlalchemy import select, insert, update, and_, or_, func, delete, lambda_stmt, literal, text, ColumnElement, Select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload, selectinload
 
-from app.models.models import Product, ProductSupplier
+from app.models.models import Product, ProductSupplier, PriceHistory, StockHistory, Supplier
 from app.schemas.product import ProductCreate, ProductUpdate
-from app.repositories.base import BaseRepository
+from app.core.exceptions import NotFoundException
+from app.repositories.base import BaseRepository, write_version
+from app.repositories.supplier import supplier_to_dict
+
+# Batches at least this large are loaded with COPY instead of INSERT
+COPY_MIN_ROWS = 100
+
+# Listing pages are cached briefly; local product and supplier writes clear the
+# cache, while writes made by other workers become visible once the TTL expires
+LIST_CACHE_SIZE = 512
+LIST_CACHE_TTL = 5
+
+# Filter keys carrying a {"min": ..., "max": ...} range, and the column each bounds
+_RANGE_FILTERS = {
+    "price_range": Product.price,
+    "stock_range": Product.stock_quantity,
+}
+
+_COPY_COLUMNS = (
+    "id",
+    "name",
+    "price",
+    "description",
+    "stock_quantity",
+    "category",
+    "discount",
+    "created_at",
+    "updated_at",
+)
+
+
+def product_to_dict(product: Product) -> Dict[str, Any]:
+    """
+    Build the ProductResponse payload straight from a trusted ORM row.
+    """
+    return {
+        "id": product.id,
+        "name": product.name,
+        "price": product.price,
+        "description": product.description,
+        "stock_quantity": product.stock_quantity,
+        "category": product.category,
+        "discount": product.discount,
+        "created_at": product.created_at,
+        "updated_at": product.updated_at,
+        "suppliers": [supplier_to_dict(supplier) for supplier in product.suppliers],
+    }
 
 
 class ProductRepository(BaseRepository[Product, ProductCreate, ProductUpdate]):
@@ -16,59 +65,105 @@ class ProductRepository(BaseRepository[Product, ProductCreate, ProductUpdate]):
     
     def __init__(self):
         super().__init__(Product)
+        self._list_cache = TTLCache(maxsize=LIST_CACHE_SIZE, ttl=LIST_CACHE_TTL)
+    
+    async def get(self, db: AsyncSession, id: Any) -> Optional[Product]:
+        """
+        Get a product by ID with its suppliers eagerly loaded.
+        """
+        result = await db.get(Product, id, options=[selectinload(Product.suppliers)])
+        if not result:
+            raise NotFoundException(f"Product with id {id} not found")
+        return result
+    
+    async def exists(self, db: AsyncSession, id: Any) -> bool:
+        """
+        Check whether a product exists without loading the row.
+        """
+        result = await db.execute(select(select(Product.id).where(Product.id == id).exists()))
+        return result.scalar_one()
+    
+    async def get_name(self, db: AsyncSession, id: Any) -> Optional[str]:
+        """
+        Get only a product's name, or None if the product does not exist.
+        """
+        result = await db.execute(select(Product.name).where(Product.id == id))
+        return result.scalar_one_or_none()
+    
+    async def get_many(self, db: AsyncSession, ids: List[Any]) -> Dict[Any, Product]:
+        """
+        Get several products by ID with one IN query, keyed by ID.
+        
+        IDs that do not exist are simply absent from the result.
+        """
+        if not ids:
+            return {}
+        result = await db.execute(select(Product).where(Product.id.in_(ids)))
+        return {product.id: product for product in result.scalars().all()}
     
     async def get_with_suppliers(self, db: AsyncSession, id: Any) -> Optional[Product]:
         """
         Get a product by ID with its suppliers loaded.
+        
+        For a single row a JOIN fetches the suppliers in the same round trip,
+        where selectinload would need a second IN query.
         """
         query = select(Product).where(Product.id == id).options(
-            selectinload(Product.suppliers)
+            joinedload(Product.suppliers)
         )
         result = await db.execute(query)
-        return result.scalar_one_or_none()
+        return result.unique().scalar_one_or_none()
     
-    async def get_multi_with_suppliers(
-        self, 
-        db: AsyncSession, 
-        *, 
-        skip: int = 0, 
+    def _build_filter(self, kwargs: Dict[str, Any]) -> Optional[ColumnElement]:
+        """
+        Build the WHERE clause for product filters, or None when nothing applies.
+        
+        Understands ``category``, ``price_range`` / ``stock_range`` min/max
+        dicts, ``search_term`` and exact matches on any product column. This
+        is the single filter path for listing, searching and counting; callers
+        that need both a page and a count build the clause once and reuse it.
+        """
+        filter_conditions = []
+        for key, value in kwargs.items():
+            if key in _RANGE_FILTERS:
+                if isinstance(value, dict):
+                    column = _RANGE_FILTERS[key]
+                    if value.get("min") is not None:
+                        filter_conditions.append(column >= value["min"])
+                    if value.get("max") is not None:
+                        filter_conditions.append(column <= value["max"])
+            elif key == "search_term":
+                if value:
+                    filter_conditions.append(self._search_condition(value))
+            elif key == "category":
+                if value:
+                    filter_conditions.append(Product.category == value)
+            elif key in self._columns and value is not None:
+                filter_conditions.append(self._col_attrs[key] == value)
+        
+        return and_(*filter_conditions) if filter_conditions else None
+    
+    def _build_multi_with_suppliers_query(
+        self,
+        *,
+        clause: Optional[ColumnElement] = None,
+        skip: int = 0,
         limit: int = 100,
         sort_by: Optional[str] = None,
-        sort_order: Optional[str] = None,
-        **kwargs
-    ) -> List[Product]:
+        sort_order: Optional[str] = None
+    ) -> Select:
         """
-        Get multiple products with their suppliers loaded, with pagination and filtering.
+        Build the paginated, filtered and sorted product query with suppliers loaded.
         """
         query = select(Product).options(
             selectinload(Product.suppliers)
         )
-        
-        # Apply filters
-        if kwargs:
-            filter_conditions = []
-            for key, value in kwargs.items():
-                if key == "category" and value:
-                    filter_conditions.append(Product.category == value)
-                elif key == "price_range" and isinstance(value, dict):
-                    if "min" in value and value["min"] is not None:
-                        filter_conditions.append(Product.price >= value["min"])
-                    if "max" in value and value["max"] is not None:
-                        filter_conditions.append(Product.price <= value["max"])
-                elif key == "stock_range" and isinstance(value, dict):
-                    if "min" in value and value["min"] is not None:
-                        filter_conditions.append(Product.stock_quantity >= value["min"])
-                    if "max" in value and value["max"] is not None:
-                        filter_conditions.append(Product.stock_quantity <= value["max"])
-                elif hasattr(Product, key) and value is not None:
-                    filter_conditions.append(getattr(Product, key) == value)
-            
-            if filter_conditions:
-                query = query.where(and_(*filter_conditions))
+        if clause is not None:
+            query = query.where(clause)
 
         # Apply sorting
-        if sort_by and hasattr(Product, sort_by):
-            column = getattr(Product, sort_by)
+        if sort_by in self._columns:
+            column = self._col_attrs[sort_by]
             if sort_order and sort_order.lower() == 'desc':
                 query = query.order_by(column.desc())
             else:
@@ -77,51 +172,147 @@ class ProductRepository(BaseRepository[Product, ProductCreate, ProductUpdate]):
             query = query.order_by(Product.id.asc())
 
         # Apply pagination
-        query = query.offset(skip).limit(limit)
+        return query.offset(skip).limit(limit)
+    
+    async def get_multi_with_suppliers(
+        self, 
+        db: AsyncSession, 
+        *, 
+        skip: int = 0, 
+        limit: int = 100,
+        sort_by: Optional[str] = None,
+        sort_order: Optional[str] = None,
+        **kwargs
+    ) -> List[Dict[str, Any]]:
+        """
+        Get a page of products with their suppliers as ProductResponse
+        payloads, with pagination and filtering.
+        
+        Pages are served from a short-lived in-process cache keyed on the
+        arguments and the product and supplier write versions, so repeated
+        requests for hot pages skip both the product query and the supplier
+        selectin query. Only plain payloads are cached, never ORM objects,
+        and any committed product or supplier write on this worker makes the
+        cached pages unreachable.
+        """
+        key = (
+            write_version(Product.__tablename__, Supplier.__tablename__),
+            skip,
+            limit,
+            sort_by,
+            sort_order,
+            frozenset(
+                (name, frozenset(value.items()) if isinstance(value, dict) else value)
+                for name, value in kwargs.items()
+            )
+        )
+        products = self._list_cache.get(key)
+        if products is None:
+            query = self._build_multi_with_suppliers_query(
+                clause=self._build_filter(kwargs),
+                skip=skip,
+                limit=limit,
+                sort_by=sort_by,
+                sort_order=sort_order
+            )
+            result = await db.execute(query)
+            products = [product_to_dict(product) for product in result.scalars().all()]
+            self._list_cache[key] = products
+        return list(products)
+    
+    async def get_multi_with_suppliers_and_total(
+        self, 
+        db: AsyncSession, 
+        *, 
+        skip: int = 0, 
+        limit: int = 100,
+        sort_by: Optional[str] = None,
+        sort_order: Optional[str] = None,
+        **kwargs
+    ) -> Tuple[List[Product], int]:
+        """
+        Get a page of products with their suppliers loaded, together with the
+        total number of products matching the filters.
+        
+        The total is computed with a COUNT(*) OVER() window column so the
+        page and the total come back in a single query.
+        """
+        clause = self._build_filter(kwargs)
+        query = self._build_multi_with_suppliers_query(
+            clause=clause,
+            skip=skip,
+            limit=limit,
+            sort_by=sort_by,
+            sort_order=sort_order
+        ).add_columns(func.count().over().label("_total"))
         
         result = await db.execute(query)
-        return result.scalars().all()
+        rows = result.all()
+        
+        if rows:
+            return [row[0] for row in rows], rows[0]._total
+        
+        # An empty page past the end carries no window column to read from
+        total = await self._count_where(db, clause) if skip else 0
+        return [], total
+    
+    @staticmethod
+    def _search_condition(search_term: str):
+        """
+        Match the term anywhere in the name or description, case-insensitively.
+        
+        Written as lower(col) LIKE lower(:term) so the lower() trigram GIN
+        indexes on products can serve it. A term ending in ``*`` is a prefix
+        search on the name instead, compared lowercased on both sides so the
+        lower(name) text_pattern_ops B-tree serves it.
+        """
+        if search_term.endswith("*"):
+            return func.lower(Product.name).startswith(search_term[:-1].lower(), autoescape=True)
+        
+        pattern = func.lower(f"%{search_term}%")
+        return or_(
+            func.lower(Product.name).like(pattern),
+            func.lower(Product.description).like(pattern)
+        )
     
     async def count(self, db: AsyncSession, **kwargs) -> int:
         """
         Count total products with filters applied.
         """
+        return await self._count_where(db, self._build_filter(kwargs))
+    
+    async def _count_where(self, db: AsyncSession, clause: Optional[ColumnElement]) -> int:
+        """
+        Count products matching an already built filter clause.
+        """
         query = select(func.count(Product.id))
-        
-        # Apply filters
-        if kwargs:
-            filter_conditions = []
-            for key, value in kwargs.items():
-                if key == "category" and value:
-                    filter_conditions.append(Product.category == value)
-                elif key == "price_range" and isinstance(value, dict):
-                    if "min" in value and value["min"] is not None:
-                        filter_conditions.append(Product.price >= value["min"])
-                    if "max" in value and value["max"] is not None:
-                        filter_conditions.append(Product.price <= value["max"])
-                elif key == "stock_range" and isinstance(value, dict):
-                    if "min" in value and value["min"] is not None:
-                        filter_conditions.append(Product.stock_quantity >= value["min"])
-                    if "max" in value and value["max"] is not None:
-                        filter_conditions.append(Product.stock_quantity <= value["max"])
-                elif key == "search_term" and value:
-                    # For search functionality
-                    filter_conditions.append(
-                        or_(
-                            Product.name.ilike(f"%{value}%"),
-                            Product.description.ilike(f"%{value}%")
-                        )
-                    )
-                elif hasattr(Product, key) and value is not None:
-                    filter_conditions.append(getattr(Product, key) == value)
-            
-            if filter_conditions:
-                query = query.where(and_(*filter_conditions))
+        if clause is not None:
+            query = query.where(clause)
         
         result = await db.execute(query)
         return result.scalar_one()
 
 
+    def _build_search_query(
+        self,
+        *,
+        clause: Optional[ColumnElement] = None,
+        skip: int = 0,
+        limit: int = 100
+    ) -> Select:
+        """
+        Build the paginated product search query with suppliers loaded.
+        """
+        query = select(Product)
+        if clause is not None:
+            query = query.where(clause)
+        
+        # Apply pagination
+        query = query.offset(skip).limit(limit)
+        
+        # Add supplier loading
+        return query.options(selectinload(Product.suppliers))
+    
     async def search_products(
         self,
         db: AsyncSession,
@@ -134,104 +325,142 @@ class ProductRepository(BaseRepository[Product, ProductCreate, ProductUpdate]):
         """
         Search for products by name or description.
         """
-        search_conditions = [
-            Product.name.ilike(f"%{search_term}%"),
-            Product.description.ilike(f"%{search_term}%")
-        ]
-        
-        query = select(Product).where(or_(*search_conditions))
-        
-        # Apply additional filters
-        if kwargs:
-            filter_conditions = []
-            for key, value in kwargs.items():
-                if hasattr(Product, key):
-                    if key == "category" and value:
-                        filter_conditions.append(Product.category == value)
-                    elif key == "price_range" and isinstance(value, dict):
-                        if "min" in value and value["min"] is not None:
-                            filter_conditions.append(Product.price >= value["min"])
-                        if "max" in value and value["max"] is not None:
-                            filter_conditions.append(Product.price <= value["max"])
-                    elif key == "stock_range" and isinstance(value, dict):
-                        if "min" in value and value["min"] is not None:
-                            filter_conditions.append(Product.stock_quantity >= value["min"])
-                        if "max" in value and value["max"] is not None:
-                            filter_conditions.append(Product.stock_quantity <= value["max"])
-                    elif value is not None:
-                        filter_conditions.append(getattr(Product, key) == value)
-            
-            if filter_conditions:
-                query = query.where(and_(*filter_conditions))
+        query = self._build_search_query(
+            clause=self._build_filter({"search_term": search_term, **kwargs}),
+            skip=skip,
+            limit=limit
+        )
+        result = await db.execute(query)
+        return result.scalars().all()
+    
+    async def search_products_with_total(
+        self,
+        db: AsyncSession,
+        *,
+        search_term: str,
+        skip: int = 0,
+        limit: int = 100,
+        **kwargs
+    ) -> Tuple[List[Product], int]:
+        """
+        Search for products by name or description, returning the page together
+        with the total number of matches from a COUNT(*) OVER() window column.
+        """
+        clause = self._build_filter({"search_term": search_term, **kwargs})
+        query = self._build_search_query(
+            clause=clause,
+            skip=skip,
+            limit=limit
+        ).add_columns(func.count().over().label("_total"))
         
-        # Apply pagination
-        query = query.offset(skip).limit(limit)
+        result = await db.execute(query)
+        rows = result.all()
         
-        # Add supplier loading
-        query = query.options(selectinload(Product.suppliers))
+        if rows:
+            return [row[0] for row in rows], rows[0]._total
         
+        # An empty page past the end carries no window column to read from
+        total = await self._count_where(db, clause) if skip else 0
+        return [], total
+    
+    async def _reload_with_suppliers(self, db: AsyncSession, id: Any) -> Optional[Product]:
+        """
+        Re-read a product and its suppliers, overwriting any stale copy in the session.
+        """
+        query = (
+            select(Product)
+            .where(Product.id == id)
+            .options(joinedload(Product.suppliers))
+            .execution_options(populate_existing=True)
+        )
         result = await db.execute(query)
-        return result.scalars().all()
+        return result.unique().scalar_one_or_none()
     
     async def add_supplier(
         self, 
         db: AsyncSession, 
         *, 
         product_id: int, 
-        supplier_id: int
-    ) -> Product:
+        supplier_id: int,
+        refresh: bool = True
+    ) -> Optional[Product]:
         """
         Add a supplier to a product.
+        
+        The link is written with INSERT ... ON CONFLICT DO NOTHING, so an
+        existing association costs no extra lookup. Pass ``refresh=False``
+        to skip reloading the product when the caller does not need it.
+        """
+        stmt = pg_insert(ProductSupplier).values(
+            product_id=product_id,
+            supplier_id=supplier_id
+        ).on_conflict_do_nothing(index_elements=["product_id", "supplier_id"])
+        await db.execute(stmt)
+        await db.commit()
+        self._on_write()
+        
+        if not refresh:
+            return None
+        
+        # Return the product with its suppliers
+        return await self._reload_with_suppliers(db, product_id)
+    
+    async def bulk_add_suppliers(
+        self,
+        db: AsyncSession,
+        *,
+        product_id: int,
+        supplier_ids: List[int]
+    ) -> Optional[Product]:
         """
-        # Check if association already exists
-        query = select(ProductSupplier).where(
-            and_(
-                ProductSupplier.product_id == product_id,
-                ProductSupplier.supplier_id == supplier_id
-            )
-        )
-        result = await db.execute(query)
-        association = result.scalar_one_or_none()
+        Link several suppliers to a product with a single statement, and
+        return the product re-read with its suppliers.
         
-        if not association:
-            # Create new association
-            association = ProductSupplier(
-                product_id=product_id,
-                supplier_id=supplier_id
-            )
-            db.add(association)
+        Written as INSERT ... SELECT from suppliers, so IDs that do not exist
+        are skipped without a separate lookup, and ON CONFLICT DO NOTHING
+        skips links that already exist.
+        """
+        if supplier_ids:
+            stmt = pg_insert(ProductSupplier).from_select(
+                ["product_id", "supplier_id"],
+                select(literal(product_id), Supplier.id).where(Supplier.id.in_(supplier_ids))
+            ).on_conflict_do_nothing(index_elements=["product_id", "supplier_id"])
+            await db.execute(stmt)
             await db.commit()
+            self._on_write()
         
-        # Return the product with its suppliers
-        return await self.get_with_suppliers(db, product_id)
+        return await self._reload_with_suppliers(db, product_id)
     
     async def remove_supplier(
         self, 
         db: AsyncSession, 
         *, 
         product_id: int, 
-        supplier_id: int
-    ) -> Product:
+        supplier_id: int,
+        refresh: bool = True
+    ) -> Optional[Product]:
         """
         Remove a supplier from a product.
-        """
-        # Find the association
-        query = select(ProductSupplier).where(
-            and_(
-                ProductSupplier.product_id == product_id,
-                ProductSupplier.supplier_id == supplier_id
+        
+        The link is removed with a single DELETE. Pass ``refresh=False`` to
+        skip reloading the product when the caller does not need it.
+        """
+        await db.execute(
+            delete(ProductSupplier).where(
+                and_(
+                    ProductSupplier.c.product_id == product_id,
+                    ProductSupplier.c.supplier_id == supplier_id
+                )
             )
         )
-        result = await db.execute(query)
-        association = result.scalar_one_or_none()
+        await db.commit()
+        self._on_write()
         
-        if association:
-            # Delete the association
-            await db.delete(association)
-            await db.commit()
+        if not refresh:
+            return None
         
         # Return the product with its updated suppliers
-        return await self.get_with_suppliers(db, product_id)
+        return await self._reload_with_suppliers(db, product_id)
     
     async def get_by_category(
         self, 
@@ -244,8 +473,9 @@ class ProductRepository(BaseRepository[Product, ProductCreate, ProductUpdate]):
         """
         Get products by category.
         """
-        query = select(Product).where(Product.category == category).offset(skip).limit(limit)
-        result = await db.execute(query)
+        stmt = lambda_stmt(lambda: select(Product).where(Product.category == category))
+        stmt += lambda s: s.offset(skip).limit(limit)
+        result = await db.execute(stmt)
         return result.scalars().all()
     
     async def get_by_price_range(
@@ -311,8 +541,9 @@ class ProductRepository(BaseRepository[Product, ProductCreate, ProductUpdate]):
         """
         Get products with stock quantity below the specified threshold.
         """
-        query = select(Product).where(Product.stock_quantity < threshold).offset(skip).limit(limit)
-        result = await db.execute(query)
+        stmt = lambda_stmt(lambda: select(Product).where(Product.stock_quantity < threshold))
+        stmt += lambda s: s.offset(skip).limit(limit)
+        result = await db.execute(stmt)
         return result.scalars().all()
     
     async def count_by_category(self, db: AsyncSession) -> Dict[str, int]:
@@ -323,6 +554,44 @@ class ProductRepository(BaseRepository[Product, ProductCreate, ProductUpdate]):
         result = await db.execute(query)
         return {category: count for category, count in result.all()}
     
+    async def count_by_category_with_low_stock(
+        self,
+        db: AsyncSession,
+        *,
+        threshold: int = 10
+    ) -> Dict[str, Tuple[int, int]]:
+        """
+        Count products, and those with stock below the threshold, by category.
+        
+        Both counts come from one grouped scan using an aggregate FILTER,
+        mapping each category to ``(count, low_stock_count)``.
+        """
+        stmt = lambda_stmt(
+            lambda: select(
+                Product.category,
+                func.count(),
+                func.count().filter(Product.stock_quantity < threshold)
+            ).group_by(Product.category)
+        )
+        result = await db.execute(stmt)
+        return {category: (count, low_stock) for category, count, low_stock in result.all()}
+    
+    async def _insert_returning(self, db: AsyncSession, rows: List[Dict[str, Any]]) -> List[Product]:
+        """
+        Insert product rows with one INSERT ... RETURNING and commit.
+        
+        insertmanyvalues pages the rows into multi-row VALUES batches and the
+        returned products are fully populated, so no per-row refresh is needed.
+        """
+        if not rows:
+            return []
+        
+        result = await db.scalars(insert(Product).returning(Product), rows)
+        products = result.all()
+        await db.commit()
+        self._on_write()
+        return products
+    
     async def create_multi(
         self, 
         db: AsyncSession, 
@@ -332,20 +601,7 @@ class ProductRepository(BaseRepository[Product, ProductCreate, ProductUpdate]):
         """
         Create multiple products in a batch operation.
         """
-        products = []
-        for obj_in in objs_in:
-            # Convert Pydantic model to dict
-            obj_in_data = obj_in.model_dump(exclude_unset=True)
-            db_obj = Product(**obj_in_data)
-            db.add(db_obj)
-            products.append(db_obj)
-        
-        await db.commit()
-        # Refresh the objects to get generated values
-        for product in products:
-            await db.refresh(product)
-        
-        return products
+        return await self._insert_returning(db, self._dump_rows(objs_in, exclude_unset=True))
 
     async def update_multi(
         self, 
@@ -355,25 +611,56 @@ class ProductRepository(BaseRepository[Product, ProductCreate, ProductUpdate]):
     ) -> List[Product]:
         """
         Update multiple products in a batch operation.
+        
+        When every update carries the same changes they are applied with one
+        UPDATE ... WHERE id IN (...) RETURNING. Otherwise the updates are sent
+        as a single executemany UPDATE keyed on the primary key. IDs that do
+        not exist are skipped.
         """
-        updated_products = []
+        changes_by_id = {}
         for update_data in updates:
             if "id" not in update_data:
                 continue
-                
-            product_id = update_data.pop("id")
-            db_obj = await self.get(db, id=product_id)
-            
-            if db_obj:
-                # Update product attributes
-                for field, value in update_data.items():
-                    if hasattr(db_obj, field):
-                        setattr(db_obj, field, value)
-                
-                updated_products.append(db_obj)
+            changes_by_id[update_data["id"]] = {
+                field: value for field, value in update_data.items()
+                if field != "id" and field in self._columns
+            }
         
-        await db.commit()
-        return updated_products
+        if not changes_by_id:
+            return []
+        
+        ids = list(changes_by_id)
+        changes = list(changes_by_id.values())
+        
+        if all(change == changes[0] for change in changes) and changes[0]:
+            result = await db.scalars(
+                update(Product)
+                .where(Product.id.in_(ids))
+                .values(**changes[0])
+                .returning(Product)
+            )
+            updated_products = result.all()
+            await db.commit()
+            self._on_write()
+            return updated_products
+        
+        result = await db.execute(select(Product.id).where(Product.id.in_(ids)))
+        existing_ids = set(result.scalars().all())
+        rows = [
+            {"id": product_id, **change}
+            for product_id, change in changes_by_id.items()
+            if product_id in existing_ids and change
+        ]
+        if rows:
+            await db.execute(update(Product), rows)
+            await db.commit()
+            self._on_write()
+        
+        query = select(Product).where(Product.id.in_(existing_ids)).execution_options(
+            populate_existing=True
+        )
+        result = await db.execute(query)
+        return result.scalars().all()
 
     async def delete_multi(
         self, 
@@ -383,48 +670,124 @@ class ProductRepository(BaseRepository[Product, ProductCreate, ProductUpdate]):
     ) -> List[int]:
         """
         Delete multiple products in a batch operation.
+        
+        Returns the IDs that were actually deleted; missing IDs are skipped.
         """
-        deleted_ids = []
-        for product_id in ids:
-            db_obj = await self.get(db, id=product_id)
-            if db_obj:
-                await db.delete(db_obj)
-                deleted_ids.append(product_id)
+        if not ids:
+            return []
         
+        await db.execute(delete(ProductSupplier).where(ProductSupplier.c.product_id.in_(ids)))
+        await db.execute(delete(PriceHistory).where(PriceHistory.product_id.in_(ids)))
+        await db.execute(delete(StockHistory).where(StockHistory.product_id.in_(ids)))
+        result = await db.execute(
+            delete(Product)
+            .where(Product.id.in_(ids))
+            .returning(Product.id)
+            .execution_options(synchronize_session=False)
+        )
+        deleted_ids = result.scalars().all()
         await db.commit()
+        self._on_write()
         return deleted_ids
     
-    async def batch_create(
+    async def bulk_delete(
         self, 
         db: AsyncSession, 
         *, 
-        objs_in: List[ProductCreate]
+        ids: List[int]
     ) -> List[Product]:
         """
-        Create multiple products in a batch operation.
+        Delete all existing products among the given IDs with set-based statements.
+        
+        Products are loaded once (with suppliers, for the response) and then
+        removed together with their history and supplier links, instead of
+        issuing a SELECT and a DELETE per ID. Missing IDs are skipped.
         """
-        products = []
-        for obj_in in objs_in:
-            # Convert Pydantic model to dict
-            obj_in_data = obj_in.model_dump()
-            db_obj = Product(**obj_in_data)
-            db.add(db_obj)
-            products.append(db_obj)
+        if not ids:
+            return []
         
-        await db.commit()
+        query = select(Product).where(Product.id.in_(ids)).options(
+            selectinload(Product.suppliers)
+        )
+        result = await db.execute(query)
+        products = result.scalars().all()
         
-        # Refresh all products to get their generated IDs
-        for product in products:
-            await db.refresh(product)
+        if not products:
+            return []
         
+        found_ids = [product.id for product in products]
+        await db.execute(delete(ProductSupplier).where(ProductSupplier.c.product_id.in_(found_ids)))
+        await db.execute(delete(PriceHistory).where(PriceHistory.product_id.in_(found_ids)))
+        await db.execute(delete(StockHistory).where(StockHistory.product_id.in_(found_ids)))
+        await db.execute(
+            delete(Product)
+            .where(Product.id.in_(found_ids))
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        self._on_write()
         return products
     
-    async def delete(self, db: AsyncSession, *, id: Any) -> Product:
+    async def batch_create(
+        self, 
+        db: AsyncSession, 
+        *, 
+        objs_in: List[ProductCreate]
+    ) -> List[Product]:
+        """
+        Create multiple products in a batch operation.
+        """
+        return await self._insert_returning(db, self._dump_rows(objs_in))
+    
+    async def bulk_copy_create(
+        self, 
+        db: AsyncSession, 
+        *, 
+        objs_in: List[ProductCreate]
+    ) -> List[Product]:
         """
-        Delete a product by ID.
+        Create many products through PostgreSQL COPY.
+        
+        COPY skips the per-statement overhead of INSERT, which pays off for
+        large seeding payloads. It cannot return generated keys, so IDs are
+        reserved from the sequence up front and the rows are read back by ID.
+        Batches smaller than COPY_MIN_ROWS go through batch_create instead.
         """
-        obj = await self.get(db, id=id)
-        if obj:
-            await db.delete(obj)
-            await db.commit()
-        return obj
\ No newline at end of file
+        if len(objs_in) < COPY_MIN_ROWS:
+            return await self.batch_create(db, objs_in=objs_in)
+        
+        result = await db.execute(
+            text("SELECT nextval(pg_get_serial_sequence('products', 'id')) FROM generate_series(1, :n)"),
+            {"n": len(objs_in)}
+        )
+        ids = result.scalars().all()
+        
+        now = datetime.utcnow()
+        records = [
+            (
+                product_id,
+                obj_in.name,
+                obj_in.price,
+                obj_in.description,
+                obj_in.stock_quantity,
+                obj_in.category,
+                obj_in.discount if obj_in.discount is not None else 0,
+                now,
+                now,
+            )
+            for product_id, obj_in in zip(ids, objs_in)
+        ]
+        
+        connection = await db.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            Product.__tablename__,
+            records=records,
+            columns=_COPY_COLUMNS
+        )
+        await db.commit()
+        self._on_write()
+        
+        query = select(Product).where(Product.id.in_(ids)).order_by(Product.id)
+        result = await db.execute(query)
+        return result.scalars().all()
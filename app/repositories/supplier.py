@@ -1,14 +1,70 @@
 # app/repositories/supplier.py
-from typing import Any, List, Optional
-from sqlalchemy import select, and_, or_
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+from cachetools import TTLCache
+from sqlalchemy import select, insert, update, delete, and_, asc, desc, func, lambda_stmt, tuple_, Select
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.models.models import Supplier
+from app.models.models import ProductSupplier, Supplier
 from app.schemas.supplier import SupplierCreate, SupplierUpdate
 from app.repositories.base import BaseRepository
 
 
+# Sortable columns and directions, resolved once instead of via getattr per request
+_SORT_COLUMNS = {
+    "id": Supplier.id,
+    "name": Supplier.name,
+    "credit_rating": Supplier.credit_rating,
+    "created_at": Supplier.created_at,
+    "updated_at": Supplier.updated_at,
+}
+_SORT_ORDERS = {"asc": asc, "desc": desc}
+
+# Top-rated rankings are memoized briefly so dashboards polling them skip the
+# database; any committed supplier write clears them
+TOP_RATED_CACHE_SIZE = 16
+TOP_RATED_CACHE_TTL = 30
+
+
+def supplier_to_dict(supplier: Supplier) -> Dict[str, Any]:
+    """
+    Build the SupplierResponse payload straight from a trusted ORM row.
+    """
+    return {
+        "id": supplier.id,
+        "name": supplier.name,
+        "contact_info": supplier.contact_info,
+        "credit_rating": supplier.credit_rating,
+        "created_at": supplier.created_at,
+        "updated_at": supplier.updated_at,
+    }
+
+
+def _order_by(sort_by: Optional[str], sort_order: Optional[str]) -> Any:
+    """
+    Resolve a sort key and direction to an ORDER BY clause, defaulting to id ascending.
+    """
+    return _SORT_ORDERS.get(sort_order, asc)(_SORT_COLUMNS.get(sort_by, Supplier.id))
+
+
+def _paginate(query: Select, *, skip: int, limit: int, after_id: Optional[int]) -> Select:
+    """
+    Page a supplier query by keyset when ``after_id`` is given, else by offset.
+    
+    The keyset form continues in id order after ``after_id`` and replaces any
+    other ordering, so deep pages cost an index seek rather than skipping rows.
+    """
+    if after_id is not None:
+        return query.where(Supplier.id > after_id).order_by(None).order_by(Supplier.id).limit(limit)
+    return query.offset(skip).limit(limit)
+
+
+# A filter shape is the tuple of active equality filter names
+FilterShape = Tuple[str, ...]
+FilterBuilder = Callable[[Dict[str, Any]], List[Any]]
+
+
 class SupplierRepository(BaseRepository[Supplier, SupplierCreate, SupplierUpdate]):
     """
     Repository for Supplier entity with custom methods specific to suppliers.
@@ -16,16 +72,161 @@ class SupplierRepository(BaseRepository[Supplier, SupplierCreate, SupplierUpdate
     
     def __init__(self):
         super().__init__(Supplier)
+        # One prebuilt condition builder per filter shape seen so far
+        self._filter_builders: Dict[FilterShape, FilterBuilder] = {}
+        self._top_rated_cache = TTLCache(maxsize=TOP_RATED_CACHE_SIZE, ttl=TOP_RATED_CACHE_TTL)
+    
+    def _on_write(self) -> None:
+        """
+        Drop memoized top-rated rankings after a committed supplier write.
+        """
+        super()._on_write()
+        self._top_rated_cache.clear()
+    
+    async def get_by_id(self, db: AsyncSession, id: Any) -> Optional[Supplier]:
+        """
+        Get a supplier by ID without its products, or None if it does not exist.
+        
+        Supplier responses omit products, so none are loaded.
+        """
+        return await db.get(Supplier, id)
+    
+    def _filter_shape(self, kwargs: Dict[str, Any]) -> FilterShape:
+        """
+        Reduce filter values to their shape: the names of the active column filters.
+        """
+        return tuple(key for key, value in kwargs.items() if key in self._columns and value is not None)
+    
+    def _compile_filter_builder(self, shape: FilterShape) -> FilterBuilder:
+        """
+        Build a function that turns filter values of the given shape into WHERE conditions.
+        
+        Column lookups are made here once, so the returned function only reads
+        values and creates the comparisons.
+        """
+        steps = [
+            lambda values, key=key, column=self._col_attrs[key]: column == values[key]
+            for key in shape
+        ]
+        return lambda values: [step(values) for step in steps]
+    
+    def _filter_conditions(self, **kwargs) -> List[Any]:
+        """
+        Build WHERE equality conditions for supplier column filters.
+        
+        Builders are cached per filter shape, so repeat shapes skip the
+        per-key dispatch.
+        """
+        shape = self._filter_shape(kwargs)
+        builder = self._filter_builders.get(shape)
+        if builder is None:
+            builder = self._filter_builders[shape] = self._compile_filter_builder(shape)
+        return builder(kwargs)
     
-    async def get_with_products(self, db: AsyncSession, id: Any) -> Optional[Supplier]:
+    def _build_filtered_query(
+        self,
+        *,
+        credit_rating_min: Optional[int] = None,
+        credit_rating_max: Optional[int] = None,
+        **kwargs
+    ) -> Select:
         """
-        Get a supplier by ID with its products loaded.
+        Build the unpaginated supplier query with the credit rating range and
+        column filters applied.
         """
-        query = select(Supplier).where(Supplier.id == id).options(
-            selectinload(Supplier.products)
+        query = select(Supplier)
+        filter_conditions = []
+        if credit_rating_min is not None:
+            filter_conditions.append(Supplier.credit_rating >= credit_rating_min)
+        if credit_rating_max is not None:
+            filter_conditions.append(Supplier.credit_rating <= credit_rating_max)
+        filter_conditions.extend(self._filter_conditions(**kwargs))
+        if filter_conditions:
+            query = query.where(and_(*filter_conditions))
+        return query
+    
+    def _build_search_query(self, *, search_term: str, **kwargs) -> Select:
+        """
+        Build the unpaginated supplier search query with filters applied.
+        
+        Substring matches run against the lowercased search_text column, so a
+        single trigram GIN index covers both name and contact info. A term
+        ending in ``*`` is a case-insensitive prefix search on the name
+        instead, which the lower(name) text_pattern_ops B-tree serves with a
+        range scan.
+        """
+        query = self._build_filtered_query(**kwargs)
+        if search_term.endswith("*"):
+            return query.where(
+                func.lower(Supplier.name).startswith(search_term[:-1].lower(), autoescape=True)
+            )
+        
+        return query.where(Supplier.search_text.like(func.lower(f"%{search_term}%")))
+    
+    def _build_full_text_query(self, *, text_query: str, **kwargs) -> Select:
+        """
+        Build the unpaginated full-text supplier query, best matches first.
+        """
+        ts_query = func.plainto_tsquery("simple", text_query)
+        return (
+            self._build_filtered_query(**kwargs)
+            .where(Supplier.search_tsv.op("@@")(ts_query))
+            .order_by(func.ts_rank(Supplier.search_tsv, ts_query).desc())
         )
-        result = await db.execute(query)
-        return result.scalar_one_or_none()
+    
+    @staticmethod
+    def _apply_credit_rating_filter(
+        stmt: StatementLambdaElement,
+        *,
+        credit_rating: Optional[int] = None,
+        min_rating: Optional[int] = None,
+        max_rating: Optional[int] = None
+    ) -> StatementLambdaElement:
+        """
+        Extend a lambda statement with an exact and/or min/max credit rating filter.
+        """
+        if credit_rating is not None:
+            stmt += lambda s: s.where(Supplier.credit_rating == credit_rating)
+        if min_rating is not None:
+            stmt += lambda s: s.where(Supplier.credit_rating >= min_rating)
+        if max_rating is not None:
+            stmt += lambda s: s.where(Supplier.credit_rating <= max_rating)
+        return stmt
+    
+    async def _get_page_with_total(
+        self,
+        db: AsyncSession,
+        query: Select,
+        *,
+        skip: int,
+        limit: int,
+        load_products: bool = False
+    ) -> Tuple[List[Supplier], int]:
+        """
+        Fetch a page of suppliers, together with the total number of rows the
+        unpaginated query matches. Products are loaded only on request.
+        
+        The total is computed with a COUNT(*) OVER() window column so the
+        page and the total come back in a single query.
+        """
+        if load_products:
+            query = query.options(selectinload(Supplier.products))
+        page_query = (
+            query.offset(skip)
+            .limit(limit)
+            .add_columns(func.count().over().label("_total"))
+        )
+        result = await db.execute(page_query)
+        rows = result.all()
+        
+        if rows:
+            return [row[0] for row in rows], rows[0]._total
+        
+        # An empty page past the end carries no window column to read from
+        if not skip:
+            return [], 0
+        result = await db.execute(select(func.count()).select_from(query.subquery()))
+        return [], result.scalar_one()
     
     async def get_multi_with_products(
         self, 
@@ -33,40 +234,101 @@ class SupplierRepository(BaseRepository[Supplier, SupplierCreate, SupplierUpdate
         *, 
         skip: int = 0, 
         limit: int = 100,
+        sort_by: Optional[str] = None,
+        sort_order: Optional[str] = "asc",
+        after_id: Optional[int] = None,
+        load_products: bool = False,
+        credit_rating_min: Optional[int] = None,
+        credit_rating_max: Optional[int] = None,
         **kwargs
     ) -> List[Supplier]:
         """
-        Get multiple suppliers with their products loaded, with pagination and filtering.
-        """
-        query = select(Supplier).options(
-            selectinload(Supplier.products)
-        )
+        Get multiple suppliers with pagination, sorting and filtering.
         
-        # Apply filters
-        if kwargs:
-            filter_conditions = []
-            for key, value in kwargs.items():
-                if hasattr(Supplier, key):
-                    if key == "credit_rating" and value is not None:
-                        if isinstance(value, dict):
-                            if "min" in value and value["min"] is not None:
-                                filter_conditions.append(Supplier.credit_rating >= value["min"])
-                            if "max" in value and value["max"] is not None:
-                                filter_conditions.append(Supplier.credit_rating <= value["max"])
-                        else:
-                            filter_conditions.append(Supplier.credit_rating == value)
-                    elif value is not None:
-                        filter_conditions.append(getattr(Supplier, key) == value)
-            
-            if filter_conditions:
-                query = query.where(and_(*filter_conditions))
+        Passing ``after_id`` switches to keyset pagination in id order. Products
+        are loaded only with ``load_products``, since list responses omit them.
+        """
+        query = self._build_filtered_query(
+            credit_rating_min=credit_rating_min,
+            credit_rating_max=credit_rating_max,
+            **kwargs
+        ).order_by(_order_by(sort_by, sort_order))
+        if load_products:
+            query = query.options(selectinload(Supplier.products))
         
         # Apply pagination
-        query = query.offset(skip).limit(limit)
+        query = _paginate(query, skip=skip, limit=limit, after_id=after_id)
         
         result = await db.execute(query)
         return result.scalars().all()
     
+    async def get_multi_with_products_and_total(
+        self, 
+        db: AsyncSession, 
+        *, 
+        skip: int = 0, 
+        limit: int = 100,
+        sort_by: Optional[str] = None,
+        sort_order: Optional[str] = "asc",
+        load_products: bool = False,
+        credit_rating: Optional[int] = None,
+        credit_rating_min: Optional[int] = None,
+        credit_rating_max: Optional[int] = None
+    ) -> Tuple[List[Supplier], int]:
+        """
+        Get a sorted page of suppliers, together with the total number of
+        suppliers matching the credit rating filters. Products are loaded only
+        with ``load_products``.
+        
+        Built as a lambda statement so SQLAlchemy reuses the cached compiled
+        SQL across requests instead of rebuilding and re-walking the query.
+        Only the credit rating filters are supported; any other filter is
+        rejected rather than ignored, so the page and total always agree with
+        get_multi_with_products for the same filters.
+        """
+        rating_filters = {
+            "credit_rating": credit_rating,
+            "min_rating": credit_rating_min,
+            "max_rating": credit_rating_max,
+        }
+        order_by = _order_by(sort_by, sort_order)
+        
+        stmt = lambda_stmt(lambda: select(Supplier, func.count().over().label("_total")))
+        stmt = self._apply_credit_rating_filter(stmt, **rating_filters)
+        if load_products:
+            stmt += lambda s: s.options(selectinload(Supplier.products))
+        stmt += lambda s: s.order_by(order_by).offset(skip).limit(limit)
+        
+        result = await db.execute(stmt)
+        rows = result.all()
+        
+        if rows:
+            return [row[0] for row in rows], rows[0]._total
+        
+        # An empty page past the end carries no window column to read from
+        if not skip:
+            return [], 0
+        count_stmt = lambda_stmt(lambda: select(func.count()).select_from(Supplier))
+        count_stmt = self._apply_credit_rating_filter(count_stmt, **rating_filters)
+        result = await db.execute(count_stmt)
+        return [], result.scalar_one()
+    
+    async def stream_filtered(
+        self,
+        db: AsyncSession,
+        *,
+        yield_per: int = 100,
+        **kwargs
+    ) -> AsyncIterator[Supplier]:
+        """
+        Iterate over all suppliers matching the filters through a server-side
+        cursor, fetching ``yield_per`` rows at a time.
+        """
+        query = self._build_filtered_query(**kwargs).order_by(Supplier.id)
+        result = await db.stream_scalars(query.execution_options(yield_per=yield_per))
+        async for supplier in result:
+            yield supplier
+    
     async def search_suppliers(
         self,
         db: AsyncSession,
@@ -74,50 +336,159 @@ class SupplierRepository(BaseRepository[Supplier, SupplierCreate, SupplierUpdate
         search_term: str,
         skip: int = 0,
         limit: int = 100,
+        after_id: Optional[int] = None,
+        load_products: bool = False,
         **kwargs
     ) -> List[Supplier]:
         """
         Search for suppliers by name or contact information.
-        """
-        search_conditions = [
-            Supplier.name.ilike(f"%{search_term}%"),
-            Supplier.contact_info.ilike(f"%{search_term}%")
-        ]
         
-        query = select(Supplier).where(or_(*search_conditions))
-        
-        # Apply additional filters
-        if kwargs:
-            filter_conditions = []
-            for key, value in kwargs.items():
-                if hasattr(Supplier, key) and value is not None:
-                    filter_conditions.append(getattr(Supplier, key) == value)
-            
-            if filter_conditions:
-                query = query.where(and_(*filter_conditions))
+        Passing ``after_id`` switches to keyset pagination in id order. Products
+        are loaded only with ``load_products``.
+        """
+        query = self._build_search_query(search_term=search_term, **kwargs)
         
         # Apply pagination
-        query = query.offset(skip).limit(limit)
+        query = _paginate(query, skip=skip, limit=limit, after_id=after_id)
         
-        # Add product loading
-        query = query.options(selectinload(Supplier.products))
+        if load_products:
+            query = query.options(selectinload(Supplier.products))
         
         result = await db.execute(query)
         return result.scalars().all()
     
+    async def search_suppliers_with_total(
+        self,
+        db: AsyncSession,
+        *,
+        search_term: str,
+        skip: int = 0,
+        limit: int = 100,
+        load_products: bool = False,
+        **kwargs
+    ) -> Tuple[List[Supplier], int]:
+        """
+        Search for suppliers by name or contact information, together with the
+        total number of matches.
+        """
+        return await self._get_page_with_total(
+            db,
+            self._build_search_query(search_term=search_term, **kwargs),
+            skip=skip,
+            limit=limit,
+            load_products=load_products
+        )
+    
+    async def full_text_search(
+        self,
+        db: AsyncSession,
+        *,
+        text_query: str,
+        skip: int = 0,
+        limit: int = 100,
+        **kwargs
+    ) -> List[Supplier]:
+        """
+        Full-text search across supplier name and contact information, ranked by relevance.
+        """
+        query = self._build_full_text_query(text_query=text_query, **kwargs).offset(skip).limit(limit)
+        result = await db.execute(query)
+        return result.scalars().all()
+    
+    async def full_text_search_with_total(
+        self,
+        db: AsyncSession,
+        *,
+        text_query: str,
+        skip: int = 0,
+        limit: int = 100,
+        load_products: bool = False,
+        **kwargs
+    ) -> Tuple[List[Supplier], int]:
+        """
+        Full-text search across supplier name and contact information through the
+        GIN-indexed search_tsv column, together with the total number of matches.
+        """
+        return await self._get_page_with_total(
+            db,
+            self._build_full_text_query(text_query=text_query, **kwargs),
+            skip=skip,
+            limit=limit,
+            load_products=load_products
+        )
+    
+    async def bulk_create(self, db: AsyncSession, *, objs_in: List[SupplierCreate]) -> List[Supplier]:
+        """
+        Insert multiple suppliers with a single INSERT ... RETURNING statement.
+        """
+        if not objs_in:
+            return []
+        
+        result = await db.scalars(
+            insert(Supplier).returning(Supplier),
+            [obj_in.model_dump() for obj_in in objs_in]
+        )
+        suppliers = result.all()
+        await db.commit()
+        self._on_write()
+        return suppliers
+    
+    async def bulk_update(
+        self,
+        db: AsyncSession,
+        *,
+        ids: List[int],
+        obj_in: SupplierUpdate
+    ) -> List[Supplier]:
+        """
+        Apply the same changes to multiple suppliers with a single
+        UPDATE ... RETURNING statement.
+        """
+        update_data = obj_in.model_dump(exclude_unset=True)
+        if not ids or not update_data:
+            return []
+        
+        result = await db.scalars(
+            update(Supplier)
+            .where(Supplier.id.in_(ids))
+            .values(**update_data)
+            .returning(Supplier)
+        )
+        suppliers = result.all()
+        await db.commit()
+        self._on_write()
+        return suppliers
+    
+    async def batch_delete(self, db: AsyncSession, *, ids: List[Any]) -> List[Supplier]:
+        """
+        Delete multiple suppliers by their IDs, unlinking them from products first.
+        """
+        if not ids:
+            return []
+        
+        await db.execute(delete(ProductSupplier).where(ProductSupplier.c.supplier_id.in_(ids)))
+        return await super().batch_delete(db, ids=ids)
+    
     async def get_by_credit_rating(
         self, 
         db: AsyncSession, 
         *, 
         rating: int,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        after_id: Optional[int] = None
     ) -> List[Supplier]:
         """
-        Get suppliers by credit rating.
+        Get suppliers by credit rating, in id order.
+        
+        Passing ``after_id`` continues after that supplier instead of skipping rows.
         """
-        query = select(Supplier).where(Supplier.credit_rating == rating).offset(skip).limit(limit)
-        result = await db.execute(query)
+        stmt = lambda_stmt(lambda: select(Supplier).where(Supplier.credit_rating == rating))
+        if after_id is not None:
+            stmt += lambda s: s.where(Supplier.id > after_id).order_by(Supplier.id).limit(limit)
+        else:
+            stmt += lambda s: s.order_by(Supplier.id).offset(skip).limit(limit)
+        result = await db.execute(stmt)
         return result.scalars().all()
     
     async def get_by_credit_rating_range(
@@ -127,34 +498,52 @@ class SupplierRepository(BaseRepository[Supplier, SupplierCreate, SupplierUpdate
         min_rating: Optional[int] = None,
         max_rating: Optional[int] = None,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        after_id: Optional[int] = None
     ) -> List[Supplier]:
         """
-        Get suppliers within a credit rating range.
+        Get suppliers within a credit rating range, in id order.
+        
+        Passing ``after_id`` continues after that supplier instead of skipping rows.
         """
-        conditions = []
-        if min_rating is not None:
-            conditions.append(Supplier.credit_rating >= min_rating)
-        if max_rating is not None:
-            conditions.append(Supplier.credit_rating <= max_rating)
-            
-        query = select(Supplier)
-        if conditions:
-            query = query.where(and_(*conditions))
-            
-        query = query.offset(skip).limit(limit)
-        result = await db.execute(query)
+        stmt = lambda_stmt(lambda: select(Supplier))
+        stmt = self._apply_credit_rating_filter(stmt, min_rating=min_rating, max_rating=max_rating)
+        if after_id is not None:
+            stmt += lambda s: s.where(Supplier.id > after_id).order_by(Supplier.id).limit(limit)
+        else:
+            stmt += lambda s: s.order_by(Supplier.id).offset(skip).limit(limit)
+        result = await db.execute(stmt)
         return result.scalars().all()
     
     async def get_top_rated_suppliers(
         self, 
         db: AsyncSession, 
         *, 
-        limit: int = 10
+        limit: int = 10,
+        after_rating: Optional[int] = None,
+        after_id: Optional[int] = None
     ) -> List[Supplier]:
         """
-        Get the top-rated suppliers.
+        Get the top-rated suppliers, best first with ties broken by id descending.
+        
+        Passing the ``after_rating`` and ``after_id`` of the last supplier seen
+        continues the ranking from there via the (credit_rating, id) index.
+        Results are memoized for TOP_RATED_CACHE_TTL seconds.
         """
-        query = select(Supplier).order_by(Supplier.credit_rating.desc()).limit(limit)
-        result = await db.execute(query)
-        return result.scalars().all()
\ No newline at end of file
+        key = (limit, after_rating, after_id)
+        suppliers = self._top_rated_cache.get(key)
+        if suppliers is not None:
+            return list(suppliers)
+        
+        stmt = lambda_stmt(
+            lambda: select(Supplier).order_by(Supplier.credit_rating.desc(), Supplier.id.desc())
+        )
+        if after_rating is not None and after_id is not None:
+            stmt += lambda s: s.where(
+                tuple_(Supplier.credit_rating, Supplier.id) < tuple_(after_rating, after_id)
+            )
+        stmt += lambda s: s.limit(limit)
+        result = await db.execute(stmt)
+        suppliers = result.scalars().all()
+        self._top_rated_cache[key] = suppliers
+        return list(suppliers)
\ No newline at end of file
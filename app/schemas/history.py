@@ -66,6 +66,7 @@ class PriceHistoryListResponse(BaseModel):
     page: int
     page_size: int
     pages: int
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, if there may be one")
 
 
 class StockHistoryListResponse(BaseModel):
@@ -76,6 +77,7 @@ class StockHistoryListResponse(BaseModel):
     page: int
     page_size: int
     pages: int
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, if there may be one")
 
     model_config = {"from_attributes": True}
 
@@ -1,37 +1,36 @@
 #app/shcemas/product.py
 from typing import List, Optional, Annotated
 from datetime import datetime
-from pydantic import BaseModel, Field, field_validator, ConfigDict
+from pydantic import AfterValidator, BaseModel, Field, ConfigDict
 
 from app.schemas.supplier import SupplierResponse
 
 
+def _validate_cents(v: float) -> float:
+    """Ensure a price has at most 2 decimal places."""
+    # round() is exact to the nearest cent, so unlike v * 100 == int(v * 100)
+    # it accepts values such as 0.29, and it allocates no strings
+    if abs(round(v, 2) - v) > 1e-9:
+        raise ValueError("Price cannot have more than 2 decimal places")
+    return v
+
+
+# A positive amount with at most two decimal places
+Price = Annotated[float, AfterValidator(_validate_cents)]
+
+# Upper bound on items per batch request, matching the supplier batch requests
+MAX_PRODUCT_BATCH_SIZE = 100
+
+
 class ProductBase(BaseModel):
     """Base schema for product data."""
     name: str = Field(..., min_length=3, max_length=100, description="Product name")
-    price: float = Field(..., gt=0, description="Product price")
+    price: Price = Field(..., gt=0, description="Product price")
     description: Optional[str] = Field(None, description="Product description")
     stock_quantity: int = Field(..., ge=0, description="Available stock quantity")
     category: Optional[str] = Field(None, description="Product category")
     discount: Optional[float] = Field(0, ge=0, le=100, description="Discount percentage (0-100)")
 
-    @field_validator('price')
-    def validate_price(cls, v):
-        if v is None:
-            return v
-            
-        if v < 0:
-            raise ValueError("Price cannot be negative")
-        
-        # Check decimal places
-        str_value = str(v)
-        if '.' in str_value:
-            decimals = len(str_value.split('.')[1])
-            if decimals > 2:
-                raise ValueError("Price cannot have more than 2 decimal places")
-        
-        return v
-
 
 class ProductCreate(ProductBase):
     """Schema for creating a new product."""
@@ -41,20 +40,13 @@ class ProductCreate(ProductBase):
 class ProductUpdate(BaseModel):
     """Schema for updating a product."""
     name: Optional[str] = Field(None, min_length=3, max_length=100, description="Product name")
-    price: Optional[float] = Field(None, gt=0, description="Product price")
+    price: Optional[Price] = Field(None, gt=0, description="Product price")
     description: Optional[str] = Field(None, description="Product description")
     stock_quantity: Optional[int] = Field(None, ge=0, description="Available stock quantity")
     category: Optional[str] = Field(None, description="Product category")
     discount: Optional[float] = Field(None, ge=0, le=100, description="Discount percentage (0-100)")
     change_reason: Optional[str] = Field(None, description="Reason for the update")
 
-    @field_validator("price")
-    def validate_price(cls, v):
-        """Validate price to ensure it has at most 2 decimal places."""
-        if v is not None and v * 100 != int(v * 100):
-            raise ValueError("Price must have at most 2 decimal places")
-        return v
-
 
 class ProductResponse(ProductBase):
     """Schema for product response."""
@@ -93,17 +85,17 @@ class ProductBatchUpdateItem(BaseModel):
 
 class ProductBatchCreateRequest(BaseModel):
     """Schema for batch product creation request."""
-    products: List[ProductCreate]
+    products: Annotated[List[ProductCreate], Field(min_length=1, max_length=MAX_PRODUCT_BATCH_SIZE)]
 
 
 class ProductBatchUpdateRequest(BaseModel):
     """Schema for batch product update request."""
-    updates: List[ProductBatchUpdateItem]
+    updates: Annotated[List[ProductBatchUpdateItem], Field(min_length=1, max_length=MAX_PRODUCT_BATCH_SIZE)]
 
 
 class ProductBatchDeleteRequest(BaseModel):
     """Schema for batch product delete request."""
-    product_ids: List[int]
+    product_ids: Annotated[List[int], Field(min_length=1, max_length=MAX_PRODUCT_BATCH_SIZE)]
 
 class ProductBatchResponse(BaseModel):
     """Response schema for batch product operations."""
@@ -1,9 +1,14 @@
 # app/schemas/supplier.py
-from typing import List, Optional, Annotated
+from typing import List, Literal, Optional, Annotated
 from datetime import datetime
 from pydantic import BaseModel, Field, validator, conlist
 
 
+# Fields the supplier list can be sorted by
+SupplierSortField = Literal["id", "name", "credit_rating", "created_at", "updated_at"]
+SortOrder = Literal["asc", "desc"]
+
+
 class SupplierBase(BaseModel):
     """Base schema for supplier data."""
     name: str = Field(..., min_length=2, max_length=100, description="Supplier name")
@@ -0,0 +1,70 @@
+# app/services/count_cache.py
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from cachetools import TTLCache
+
+# Totals are reused for this many seconds unless a write invalidates them first
+COUNT_CACHE_TTL = 60
+COUNT_CACHE_SIZE = 1024
+
+
+def _freeze(value: Any) -> Hashable:
+    """
+    Turn a filter value (possibly a min/max dict) into a hashable key part.
+    """
+    if isinstance(value, dict):
+        return tuple(sorted(value.items()))
+    if isinstance(value, list):
+        return tuple(value)
+    return value
+
+
+class CountCache:
+    """
+    In-process cache of filtered row totals for paginated list endpoints.
+
+    Totals are kept per table so a write can drop every cached total for
+    that table at once. Other workers pick up writes when the TTL expires.
+    """
+
+    def __init__(self, maxsize: int = COUNT_CACHE_SIZE, ttl: int = COUNT_CACHE_TTL):
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._tables: Dict[str, TTLCache] = {}
+
+    @staticmethod
+    def key(**filters) -> Tuple:
+        """
+        Build a cache key from filter predicates, ignoring unset filters.
+        """
+        return tuple(sorted(
+            (name, _freeze(value)) for name, value in filters.items() if value is not None
+        ))
+
+    def get(self, table: str, key: Tuple) -> Optional[int]:
+        """
+        Return the cached total for the key, or None if it is missing or expired.
+        """
+        cache = self._tables.get(table)
+        return cache.get(key) if cache is not None else None
+
+    def set(self, table: str, key: Tuple, total: int) -> None:
+        """
+        Remember the total for the key.
+        """
+        cache = self._tables.get(table)
+        if cache is None:
+            cache = self._tables[table] = TTLCache(maxsize=self._maxsize, ttl=self._ttl)
+        cache[key] = total
+
+    def invalidate(self, table: Optional[str] = None) -> None:
+        """
+        Drop cached totals for one table, or for every table when none is given.
+        """
+        if table is None:
+            self._tables.clear()
+        else:
+            self._tables.pop(table, None)
+
+
+count_cache = CountCache()
@@ -1,10 +1,15 @@
 # app/services/history.py
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any, Tuple
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.repositories.history import PriceHistoryRepository, StockHistoryRepository
+from app.repositories.history import (
+    HistoryCursor,
+    PriceHistoryRepository,
+    StockHistoryRepository,
+    get_combined_history,
+)
 from app.repositories.product import ProductRepository
 from app.schemas.history import PriceHistoryResponse, StockHistoryResponse
 
@@ -24,6 +29,16 @@ class HistoryService:
         self.stock_history_repository = stock_history_repository
         self.product_repository = product_repository
     
+    async def ensure_product_exists(self, db: AsyncSession, product_id: int) -> None:
+        """
+        Raise a 404 unless the product exists.
+        """
+        if not await self.product_repository.exists(db, product_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Product with ID {product_id} not found"
+            )
+    
     async def get_price_history(
         self,
         db: AsyncSession,
@@ -31,17 +46,11 @@ class HistoryService:
         product_id: int,
         skip: int = 0,
         limit: int = 100
-    ) -> List[PriceHistoryResponse]:
+    ) -> List[Dict[str, Any]]:
         """
         Get price history records for a specific product.
         """
-        # Check if product exists
-        product = await self.product_repository.get(db, product_id)
-        if not product:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Product with ID {product_id} not found"
-            )
+        await self.ensure_product_exists(db, product_id)
         
         return await self.price_history_repository.get_by_product_id(
             db,
@@ -50,6 +59,34 @@ class HistoryService:
             limit=limit
         )
     
+    async def get_price_history_page(
+        self,
+        db: AsyncSession,
+        *,
+        product_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[HistoryCursor] = None
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Get a page of price history records for a specific product, optionally
+        within a date range, together with the total record count.
+        A ``cursor`` continues after the last row of the previous page.
+        """
+        await self.ensure_product_exists(db, product_id)
+        
+        return await self.price_history_repository.get_page_with_total(
+            db,
+            product_id=product_id,
+            start_date=start_date,
+            end_date=end_date,
+            skip=skip,
+            limit=limit,
+            cursor=cursor
+        )
+    
     async def get_price_history_by_date_range(
         self,
         db: AsyncSession,
@@ -59,17 +96,11 @@ class HistoryService:
         end_date: Optional[datetime] = None,
         skip: int = 0,
         limit: int = 100
-    ) -> List[PriceHistoryResponse]:
+    ) -> List[Dict[str, Any]]:
         """
         Get price history records for a specific product within a date range.
         """
-        # Check if product exists
-        product = await self.product_repository.get(db, product_id)
-        if not product:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Product with ID {product_id} not found"
-            )
+        await self.ensure_product_exists(db, product_id)
         
         return await self.price_history_repository.get_by_date_range(
             db,
@@ -80,6 +111,26 @@ class HistoryService:
             limit=limit
         )
     
+    def stream_price_history(
+        self,
+        db: AsyncSession,
+        *,
+        product_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream all price history records for a product without loading them at once.
+        
+        The product is not checked here; call ensure_product_exists first.
+        """
+        return self.price_history_repository.iter_by_date_range(
+            db,
+            product_id=product_id,
+            start_date=start_date,
+            end_date=end_date
+        )
+    
     async def get_stock_history(
         self,
         db: AsyncSession,
@@ -87,17 +138,11 @@ class HistoryService:
         product_id: int,
         skip: int = 0,
         limit: int = 100
-    ) -> List[StockHistoryResponse]:
+    ) -> List[Dict[str, Any]]:
         """
         Get stock history records for a specific product.
         """
-        # Check if product exists
-        product = await self.product_repository.get(db, product_id)
-        if not product:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Product with ID {product_id} not found"
-            )
+        await self.ensure_product_exists(db, product_id)
         
         return await self.stock_history_repository.get_by_product_id(
             db,
@@ -106,6 +151,34 @@ class HistoryService:
             limit=limit
         )
     
+    async def get_stock_history_page(
+        self,
+        db: AsyncSession,
+        *,
+        product_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[HistoryCursor] = None
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Get a page of stock history records for a specific product, optionally
+        within a date range, together with the total record count.
+        A ``cursor`` continues after the last row of the previous page.
+        """
+        await self.ensure_product_exists(db, product_id)
+        
+        return await self.stock_history_repository.get_page_with_total(
+            db,
+            product_id=product_id,
+            start_date=start_date,
+            end_date=end_date,
+            skip=skip,
+            limit=limit,
+            cursor=cursor
+        )
+    
     async def get_stock_history_by_date_range(
         self,
         db: AsyncSession,
@@ -115,17 +188,11 @@ class HistoryService:
         end_date: Optional[datetime] = None,
         skip: int = 0,
         limit: int = 100
-    ) -> List[StockHistoryResponse]:
+    ) -> List[Dict[str, Any]]:
         """
         Get stock history records for a specific product within a date range.
         """
-        # Check if product exists
-        product = await self.product_repository.get(db, product_id)
-        if not product:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Product with ID {product_id} not found"
-            )
+        await self.ensure_product_exists(db, product_id)
         
         return await self.stock_history_repository.get_by_date_range(
             db,
@@ -136,6 +203,26 @@ class HistoryService:
             limit=limit
         )
     
+    def stream_stock_history(
+        self,
+        db: AsyncSession,
+        *,
+        product_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream all stock history records for a product without loading them at once.
+        
+        The product is not checked here; call ensure_product_exists first.
+        """
+        return self.stock_history_repository.iter_by_date_range(
+            db,
+            product_id=product_id,
+            start_date=start_date,
+            end_date=end_date
+        )
+    
     async def add_price_change(
         self,
         db: AsyncSession,
@@ -147,13 +234,7 @@ class HistoryService:
         """
         Add a new price change record.
         """
-        # Check if product exists
-        product = await self.product_repository.get(db, product_id)
-        if not product:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Product with ID {product_id} not found"
-            )
+        await self.ensure_product_exists(db, product_id)
         
         # Add price change record
         return await self.price_history_repository.add_price_change(
@@ -175,13 +256,7 @@ class HistoryService:
         """
         Add a new stock change record.
         """
-        # Check if product exists
-        product = await self.product_repository.get(db, product_id)
-        if not product:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Product with ID {product_id} not found"
-            )
+        await self.ensure_product_exists(db, product_id)
         
         # Add stock change record
         return await self.stock_history_repository.add_stock_change(
@@ -205,26 +280,7 @@ class HistoryService:
         """
         Get combined price and stock history for a product.
         """
-        # Check if product exists
-        product = await self.product_repository.get(db, product_id)
-        if not product:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Product with ID {product_id} not found"
-            )
-        
-        # Get price history
-        price_history = await self.price_history_repository.get_by_date_range(
-            db,
-            product_id=product_id,
-            start_date=start_date,
-            end_date=end_date,
-            skip=skip,
-            limit=limit
-        )
-        
-        # Get stock history
-        stock_history = await self.stock_history_repository.get_by_date_range(
+        combined = await get_combined_history(
             db,
             product_id=product_id,
             start_date=start_date,
@@ -232,11 +288,16 @@ class HistoryService:
             skip=skip,
             limit=limit
         )
+        if combined is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Product with ID {product_id} not found"
+            )
         
-        # Combine the results
+        product_name, price_history, stock_history = combined
         return {
             "product_id": product_id,
-            "product_name": product.name,
+            "product_name": product_name,
             "price_history": price_history,
             "stock_history": stock_history
-        }
\ No newline at end of file
+        }
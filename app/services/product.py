@@ -1,6 +1,6 @@
 # app/services/product.py
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -45,9 +45,10 @@ class ProductService:
         sort_by: Optional[str] = None,
         sort_order: Optional[str] = "asc",
         **filters
-    ) -> List[ProductResponse]:
+    ) -> List[Dict[str, Any]]:
         """
-        Get multiple products with filtering, sorting and pagination.
+        Get multiple products with filtering, sorting and pagination, as
+        ProductResponse payloads.
         """
         return await self.product_repository.get_multi_with_suppliers(
             db, 
@@ -58,6 +59,28 @@ class ProductService:
             **filters
         )
     
+    async def get_products_with_total(
+        self,
+        db: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        sort_by: Optional[str] = None,
+        sort_order: Optional[str] = "asc",
+        **filters
+    ) -> Tuple[List[ProductResponse], int]:
+        """
+        Get a page of products together with the total number matching the filters.
+        """
+        return await self.product_repository.get_multi_with_suppliers_and_total(
+            db, 
+            skip=skip, 
+            limit=limit,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            **filters
+        )
+    
     async def search_products(
         self,
         db: AsyncSession,
@@ -78,6 +101,26 @@ class ProductService:
             **filters
         )
     
+    async def search_products_with_total(
+        self,
+        db: AsyncSession,
+        *,
+        search_term: str,
+        skip: int = 0,
+        limit: int = 100,
+        **filters
+    ) -> Tuple[List[ProductResponse], int]:
+        """
+        Search for products by name or description, together with the total number of matches.
+        """
+        return await self.product_repository.search_products_with_total(
+            db,
+            search_term=search_term,
+            skip=skip,
+            limit=limit,
+            **filters
+        )
+    
     async def create_product(self, db: AsyncSession, *, product_in: ProductCreate) -> ProductResponse:
         """
         Create a new product.
@@ -89,21 +132,17 @@ class ProductService:
         product_data = product_in.model_dump(exclude={"supplier_ids"})
         product = await self.product_repository.create(db, obj_in=product_data)
         
-        # Add suppliers if provided
-        if supplier_ids:
-            for supplier_id in supplier_ids:
-                try:
-                    await self.product_repository.add_supplier(
-                        db,
-                        product_id=product.id,
-                        supplier_id=supplier_id
-                    )
-                except Exception as e:
-                    # Log error but continue with other suppliers
-                    print(f"Error adding supplier {supplier_id}: {str(e)}")
+        if not supplier_ids:
+            return product
         
-        # Get the product with its suppliers
-        return await self.product_repository.get_with_suppliers(db, id=product.id)
+        # Link all suppliers in one statement; unknown supplier IDs are skipped.
+        # The product comes back re-read, since the copy in the session still
+        # holds the empty supplier list it was created with.
+        return await self.product_repository.bulk_add_suppliers(
+            db,
+            product_id=product.id,
+            supplier_ids=supplier_ids
+        )
     
     # Modify update_product in app/services/product.py
     async def update_product(
@@ -132,24 +171,28 @@ class ProductService:
         elif hasattr(product_in, "dict"):
             update_data = product_in.dict(exclude_unset=True)
         
+        # History records ride along in the session and are flushed with the
+        # product update when it commits
+        history = []
+        
         # Check for price changes
         if 'price' in update_data and update_data['price'] != product.price:
-            await self.price_history_repository.add_price_change(
-                db,
+            history.append(self.price_history_repository.build_price_change(
                 product_id=product.id,
                 old_price=product.price,
                 new_price=update_data['price']
-            )
+            ))
         
         # Check for stock quantity changes
         if 'stock_quantity' in update_data and update_data['stock_quantity'] != product.stock_quantity:
-            await self.stock_history_repository.add_stock_change(
-                db,
+            history.append(self.stock_history_repository.build_stock_change(
                 product_id=product.id,
                 old_quantity=product.stock_quantity,
                 new_quantity=update_data['stock_quantity'],
                 change_reason=change_reason  # Pass the change reason
-            )
+            ))
+        
+        db.add_all(history)
         
         # Update the product
         updated_product = await self.product_repository.update(
@@ -252,14 +295,14 @@ class ProductService:
         """
         Get product statistics.
         """
-        # Get product count by category
-        category_stats = await self.product_repository.count_by_category(db)
-        
-        # Get total product count
-        total_products = await self.product_repository.count(db)
+        # Per-category totals and low-stock counts come from one grouped query
+        counts = await self.product_repository.count_by_category_with_low_stock(db, threshold=10)
+        category_stats = {category: count for category, (count, _) in counts.items()}
         
-        # Get low stock products count
-        low_stock_count = len(await self.product_repository.get_low_stock_products(db, threshold=10, limit=1000))
+        # The per-category counts already cover every product, so their sums
+        # are the exact totals without another full-table count
+        total_products = sum(category_stats.values())
+        low_stock_count = sum(low_stock for _, low_stock in counts.values())
         
         # Compile statistics
         statistics = {
@@ -279,8 +322,8 @@ class ProductService:
                 detail=f"Product with ID {product_id} not found"
             )
         
-        # Ensure we have a list, even if empty
-        return product.suppliers or []
+        # Loaded with the product in one statement; an empty collection is already []
+        return product.suppliers
     
     async def count_search_results(
         self, 
@@ -310,6 +353,9 @@ class ProductService:
     ) -> List[ProductResponse]:
         """
         Create multiple products in a batch.
+        
+        Request batches are capped at MAX_PRODUCT_BATCH_SIZE rows, which one
+        INSERT ... RETURNING sends in a single round trip.
         """
         return await self.product_repository.batch_create(db, objs_in=products_in)
 
@@ -324,52 +370,56 @@ class ProductService:
         Update multiple products in a batch.
         
         Each update dict must contain an 'id' key and at least one field to update.
+        The products are loaded with one IN query, and the history records and
+        product changes are written in a single transaction.
         """
-        updated_products = []
+        products = await self.product_repository.get_many(
+            db, [update_item["id"] for update_item in updates if "id" in update_item]
+        )
+        
+        product_updates = []
         missing_products = []
+        price_changes = []
+        stock_changes = []
         
         for update_item in updates:
             if "id" not in update_item:
                 continue
                 
             product_id = update_item["id"]
-            product = await self.product_repository.get(db, id=product_id)
+            product = products.get(product_id)
             
             if not product:
                 missing_products.append(product_id)
                 continue
             
-            # Create a copy without the id for the update
-            update_data = {k: v for k, v in update_item.items() if k != "id"}
+            # Create a copy without the change reason, keeping the id for the update
+            update_data = dict(update_item)
             change_reason = update_data.pop("change_reason", None)
             
             # Track price changes
             if "price" in update_data and update_data["price"] != product.price:
-                await self.price_history_repository.add_price_change(
-                    db,
-                    product_id=product.id,
-                    old_price=product.price,
-                    new_price=update_data["price"]
-                )
+                price_changes.append({
+                    "product_id": product.id,
+                    "old_price": product.price,
+                    "new_price": update_data["price"],
+                })
             
             # Track stock changes
             if "stock_quantity" in update_data and update_data["stock_quantity"] != product.stock_quantity:
-                await self.stock_history_repository.add_stock_change(
-                    db,
-                    product_id=product.id,
-                    old_quantity=product.stock_quantity,
-                    new_quantity=update_data["stock_quantity"],
-                    change_reason=change_reason
-                )
-            
-            # Update the product
-            updated_product = await self.product_repository.update(
-                db,
-                db_obj=product,
-                obj_in=update_data
-            )
+                stock_changes.append({
+                    "product_id": product.id,
+                    "old_quantity": product.stock_quantity,
+                    "new_quantity": update_data["stock_quantity"],
+                    "change_reason": change_reason,
+                })
             
-            updated_products.append(updated_product)
+            product_updates.append(update_data)
+        
+        # History rows join the transaction that update_multi commits
+        await self.price_history_repository.add_price_changes_bulk(db, rows=price_changes, commit=False)
+        await self.stock_history_repository.add_stock_changes_bulk(db, rows=stock_changes, commit=False)
+        updated = await self.product_repository.update_multi(db, updates=product_updates)
         
         # If any products were not found, raise an exception
         if missing_products:
@@ -378,7 +428,9 @@ class ProductService:
                 detail=f"Products with IDs {missing_products} not found"
             )
         
-        return updated_products
+        # Return the products in the order their updates were given
+        updated_by_id = {product.id: product for product in updated}
+        return [updated_by_id[update_data["id"]] for update_data in product_updates]
 
 
     # Improved batch_delete_products method
@@ -390,20 +442,15 @@ class ProductService:
     ) -> List[ProductResponse]:
         """
         Delete multiple products in a batch.
-        """
-        deleted_products = []
-        not_found_ids = []
         
-        for product_id in ids:
-            product = await self.product_repository.get(db, id=product_id)
-            if product:
-                # Keep a copy of the product before deletion
-                deleted_products.append(product)
-                await self.product_repository.delete(db, id=product_id)
-            else:
-                not_found_ids.append(product_id)
+        Existing products are loaded and deleted with set-based statements;
+        any IDs that did not exist are reported with a 404 afterwards.
+        """
+        deleted_products = await self.product_repository.bulk_delete(db, ids=ids)
         
         # If we couldn't find some products, raise an exception
+        deleted_ids = {product.id for product in deleted_products}
+        not_found_ids = [product_id for product_id in ids if product_id not in deleted_ids]
         if not_found_ids:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -412,4 +459,13 @@ class ProductService:
         
         return deleted_products
 
-    
\ No newline at end of file
+    async def batch_delete_products_silently(
+        self,
+        db: AsyncSession,
+        *,
+        ids: List[int]
+    ) -> List[ProductResponse]:
+        """
+        Delete multiple products in a batch, silently skipping any that don't exist.
+        """
+        return await self.product_repository.bulk_delete(db, ids=ids)
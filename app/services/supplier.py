@@ -1,10 +1,16 @@
 # app/services/supplier.py
-from typing import List, Optional
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Tuple
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.models import Supplier
 from app.repositories.supplier import SupplierRepository
 from app.schemas.supplier import SupplierCreate, SupplierUpdate, SupplierResponse
+from app.core.pagination import total_from_page
+from app.services.count_cache import count_cache
+
+# Count cache namespace for supplier totals
+_COUNT_TABLE = "suppliers"
 
 
 class SupplierService:
@@ -17,9 +23,9 @@ class SupplierService:
     
     async def get_supplier(self, db: AsyncSession, id: int) -> SupplierResponse:
         """
-        Get a supplier by ID with products loaded.
+        Get a supplier by ID.
         """
-        supplier = await self.supplier_repository.get_with_products(db, id)
+        supplier = await self.supplier_repository.get_by_id(db, id)
         if not supplier:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -35,6 +41,7 @@ class SupplierService:
         limit: int = 100,
         sort_by: Optional[str] = None,
         sort_order: Optional[str] = "asc",
+        after_id: Optional[int] = None,
         **filters
     ) -> List[SupplierResponse]:
         """
@@ -46,6 +53,7 @@ class SupplierService:
             limit=limit,
             sort_by=sort_by,
             sort_order=sort_order,
+            after_id=after_id,
             **filters
         )
     
@@ -56,6 +64,7 @@ class SupplierService:
         search_term: str,
         skip: int = 0,
         limit: int = 100,
+        after_id: Optional[int] = None,
         **filters
     ) -> List[SupplierResponse]:
         """
@@ -66,22 +75,147 @@ class SupplierService:
             search_term=search_term,
             skip=skip,
             limit=limit,
+            after_id=after_id,
             **filters
         )
     
+    async def _page_with_cached_total(
+        self,
+        key: Tuple,
+        skip: int,
+        limit: int,
+        load_page: Callable[[], Awaitable[List[Supplier]]],
+        load_page_with_total: Callable[[], Awaitable[Tuple[List[Supplier], int]]]
+    ) -> Tuple[List[Supplier], int]:
+        """
+        Serve a page with its total, reusing a cached total when there is one.
+        
+        On a hit only the page is fetched, which stops after ``limit`` rows,
+        and a short page replaces the cached total with the exact one it shows.
+        On a miss the windowed query counts every match and seeds the cache.
+        """
+        total = count_cache.get(_COUNT_TABLE, key)
+        if total is not None:
+            suppliers = await load_page()
+            exact_total = total_from_page(skip, limit, len(suppliers))
+            return suppliers, total if exact_total is None else exact_total
+        
+        suppliers, total = await load_page_with_total()
+        count_cache.set(_COUNT_TABLE, key, total)
+        return suppliers, total
+    
+    async def get_suppliers_with_total(
+        self,
+        db: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        sort_by: Optional[str] = None,
+        sort_order: Optional[str] = "asc",
+        **filters
+    ) -> Tuple[List[SupplierResponse], int]:
+        """
+        Get a sorted page of suppliers together with the total number matching the filters.
+        """
+        return await self._page_with_cached_total(
+            count_cache.key(**filters),
+            skip,
+            limit,
+            lambda: self.supplier_repository.get_multi_with_products(
+                db,
+                skip=skip,
+                limit=limit,
+                sort_by=sort_by,
+                sort_order=sort_order,
+                **filters
+            ),
+            lambda: self.supplier_repository.get_multi_with_products_and_total(
+                db,
+                skip=skip,
+                limit=limit,
+                sort_by=sort_by,
+                sort_order=sort_order,
+                **filters
+            )
+        )
+    
+    async def search_suppliers_with_total(
+        self,
+        db: AsyncSession,
+        *,
+        search_term: str,
+        skip: int = 0,
+        limit: int = 100,
+        **filters
+    ) -> Tuple[List[SupplierResponse], int]:
+        """
+        Search for suppliers together with the total number of matches.
+        """
+        return await self._page_with_cached_total(
+            count_cache.key(search_term=search_term, **filters),
+            skip,
+            limit,
+            lambda: self.supplier_repository.search_suppliers(
+                db,
+                search_term=search_term,
+                skip=skip,
+                limit=limit,
+                **filters
+            ),
+            lambda: self.supplier_repository.search_suppliers_with_total(
+                db,
+                search_term=search_term,
+                skip=skip,
+                limit=limit,
+                **filters
+            )
+        )
+    
+    async def full_text_search_suppliers_with_total(
+        self,
+        db: AsyncSession,
+        *,
+        text_query: str,
+        skip: int = 0,
+        limit: int = 100,
+        **filters
+    ) -> Tuple[List[SupplierResponse], int]:
+        """
+        Full-text search for suppliers together with the total number of matches.
+        """
+        return await self._page_with_cached_total(
+            count_cache.key(text_query=text_query, **filters),
+            skip,
+            limit,
+            lambda: self.supplier_repository.full_text_search(
+                db,
+                text_query=text_query,
+                skip=skip,
+                limit=limit,
+                **filters
+            ),
+            lambda: self.supplier_repository.full_text_search_with_total(
+                db,
+                text_query=text_query,
+                skip=skip,
+                limit=limit,
+                **filters
+            )
+        )
+    
+    def stream_suppliers(self, db: AsyncSession, **filters) -> AsyncIterator[Supplier]:
+        """
+        Stream all suppliers matching the filters without loading them at once.
+        """
+        return self.supplier_repository.stream_filtered(db, **filters)
+    
     async def create_supplier(self, db: AsyncSession, *, supplier_in: SupplierCreate) -> SupplierResponse:
         """
         Create a new supplier.
         """
-        # Validate supplier data (check credit rating is in range, etc.)
-        if supplier_in.credit_rating < 0 or supplier_in.credit_rating > 5:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Credit rating must be between 0 and 5"
-            )
-        
         # Create the supplier
         supplier = await self.supplier_repository.create(db, obj_in=supplier_in)
+        count_cache.invalidate(_COUNT_TABLE)
         return supplier
     
     async def update_supplier(
@@ -102,19 +236,13 @@ class SupplierService:
                 detail=f"Supplier with ID {id} not found"
             )
         
-        # Validate credit rating if provided
-        if supplier_in.credit_rating is not None and (supplier_in.credit_rating < 0 or supplier_in.credit_rating > 5):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Credit rating must be between 0 and 5"
-            )
-        
         # Update the supplier
         updated_supplier = await self.supplier_repository.update(
             db,
             db_obj=supplier,
             obj_in=supplier_in
         )
+        count_cache.invalidate(_COUNT_TABLE)
         
         return updated_supplier
     
@@ -131,6 +259,7 @@ class SupplierService:
         
         # Delete the supplier
         deleted_supplier = await self.supplier_repository.delete(db, id=id)
+        count_cache.invalidate(_COUNT_TABLE)
         return deleted_supplier
     
     async def batch_create_suppliers(
@@ -141,17 +270,13 @@ class SupplierService:
     ) -> List[SupplierResponse]:
         """
         Create multiple suppliers in a batch.
-        """
-        # Validate credit ratings
-        for supplier_in in suppliers_in:
-            if supplier_in.credit_rating < 0 or supplier_in.credit_rating > 5:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Credit rating must be between 0 and 5"
-                )
         
+        Credit ratings are range-checked by SupplierCreate when the request
+        is parsed, so no per-supplier pass is needed here.
+        """
         # Create the suppliers
-        suppliers = await self.supplier_repository.batch_create(db, objs_in=suppliers_in)
+        suppliers = await self.supplier_repository.bulk_create(db, objs_in=suppliers_in)
+        count_cache.invalidate(_COUNT_TABLE)
         return suppliers
     
     async def batch_update_suppliers(
@@ -164,19 +289,13 @@ class SupplierService:
         """
         Update multiple suppliers in a batch.
         """
-        # Validate credit rating if provided
-        if update_data.credit_rating is not None and (update_data.credit_rating < 0 or update_data.credit_rating > 5):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Credit rating must be between 0 and 5"
-            )
-        
         # Update all suppliers
-        updated_suppliers = await self.supplier_repository.batch_update(
+        updated_suppliers = await self.supplier_repository.bulk_update(
             db,
             ids=ids,
             obj_in=update_data
         )
+        count_cache.invalidate(_COUNT_TABLE)
         
         return updated_suppliers
     
@@ -191,18 +310,26 @@ class SupplierService:
         """
         # Delete the suppliers
         deleted_suppliers = await self.supplier_repository.batch_delete(db, ids=ids)
+        count_cache.invalidate(_COUNT_TABLE)
         return deleted_suppliers
     
     async def get_top_rated_suppliers(
         self,
         db: AsyncSession,
         *,
-        limit: int = 10
+        limit: int = 10,
+        after_rating: Optional[int] = None,
+        after_id: Optional[int] = None
     ) -> List[SupplierResponse]:
         """
-        Get the top-rated suppliers.
+        Get the top-rated suppliers, optionally continuing after a previous page.
         """
-        return await self.supplier_repository.get_top_rated_suppliers(db, limit=limit)
+        return await self.supplier_repository.get_top_rated_suppliers(
+            db,
+            limit=limit,
+            after_rating=after_rating,
+            after_id=after_id
+        )
     
     async def get_by_credit_rating(
         self,
@@ -210,7 +337,8 @@ class SupplierService:
         *,
         rating: int,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        after_id: Optional[int] = None
     ) -> List[SupplierResponse]:
         """
         Get suppliers by credit rating.
@@ -225,7 +353,8 @@ class SupplierService:
             db,
             rating=rating,
             skip=skip,
-            limit=limit
+            limit=limit,
+            after_id=after_id
         )
     
     async def get_by_credit_rating_range(
@@ -235,7 +364,8 @@ class SupplierService:
         min_rating: Optional[int] = None,
         max_rating: Optional[int] = None,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        after_id: Optional[int] = None
     ) -> List[SupplierResponse]:
         """
         Get suppliers within a credit rating range.
@@ -263,5 +393,6 @@ class SupplierService:
             min_rating=min_rating,
             max_rating=max_rating,
             skip=skip,
-            limit=limit
+            limit=limit,
+            after_id=after_id
         )
\ No newline at end of file
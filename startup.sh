@@ -13,4 +13,4 @@ echo "PostgreSQL is up - executing application"
 python -m app.core.init_db
 
 # Start the application
-exec uvicorn app.main:app --host 0.0.0.0 --port 8000
\ No newline at end of file
+exec uvicorn app.main:app --host 0.0.0.0 --port 8000 --loop uvloop --http httptools --workers "${WEB_CONCURRENCY:-1}"
\ No newline at end of file
@@ -2,6 +2,7 @@
 import pytest
 from fastapi.testclient import TestClient
 from datetime import datetime, timezone, timedelta
+import json
 import time
 
 now = datetime.now(timezone.utc)
@@ -97,3 +98,57 @@ async def test_stock_history_tracking(client, sample_data):
     assert "Sold 10 units" in change_reasons
     assert "Restocked 20 units" in change_reasons
     assert "Returned 5 defective units" in change_reasons
+
+@pytest.mark.asyncio
+async def test_price_history_ndjson_stream(client):
+    """Test streaming a product's price history as newline-delimited JSON."""
+    product_data = {
+        "name": "Streamed History Product",
+        "description": "Product for testing the history stream",
+        "price": 10.0,
+        "stock_quantity": 5,
+        "discount": 0,
+        "category": "Test"
+    }
+    product_id = client.post("/api/v1/products/", json=product_data).json()["id"]
+    for price in (11.0, 12.0):
+        client.put(f"/api/v1/products/{product_id}", json={"price": price})
+    
+    response = client.get(f"/api/v1/history/price/{product_id}/stream")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["new_price"] for row in rows] == [12.0, 11.0]
+    assert all(row["product_id"] == product_id for row in rows)
+    
+    response = client.get("/api/v1/history/price/999999/stream")
+    assert response.status_code == 404
+
+@pytest.mark.asyncio
+async def test_price_history_total_respects_date_range(client):
+    """Test that the total and page count only cover records in the date range."""
+    product_data = {
+        "name": "Ranged History Product",
+        "description": "Product for testing history totals",
+        "price": 10.0,
+        "stock_quantity": 5,
+        "discount": 0,
+        "category": "Test"
+    }
+    product_id = client.post("/api/v1/products/", json=product_data).json()["id"]
+    for price in (11.0, 12.0):
+        client.put(f"/api/v1/products/{product_id}", json={"price": price})
+    
+    response = client.get(f"/api/v1/history/price/{product_id}")
+    assert response.json()["total"] == 2
+    
+    future = datetime.now() + timedelta(days=30)
+    response = client.get(
+        f"/api/v1/history/price/{product_id}",
+        params={"start_date": future.isoformat(), "end_date": (future + timedelta(days=1)).isoformat()}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["items"] == []
+    assert data["total"] == 0
+    assert data["pages"] == 0
@@ -0,0 +1,47 @@
+# tests/integration/test_seed_db.py
+import json
+
+import pytest
+from sqlalchemy import func, select
+
+from app.core.seed_db import seed_products
+from app.models.models import Product
+from app.repositories.product import COPY_MIN_ROWS
+
+
+def _seed_payload(count):
+    return json.dumps([
+        {
+            "name": f"Seeded Product {i}",
+            "description": "Product loaded from a seed file",
+            "price": 9.99,
+            "stock_quantity": i,
+            "discount": 0,
+            "category": "Seed"
+        }
+        for i in range(count)
+    ]).encode()
+
+
+@pytest.mark.asyncio
+async def test_seed_large_batch_through_copy(test_db):
+    """Test that a seed file above the COPY threshold loads every product."""
+    count = COPY_MIN_ROWS + 50
+    products = await seed_products(test_db, _seed_payload(count))
+
+    assert len(products) == count
+    assert [product.name for product in products] == [f"Seeded Product {i}" for i in range(count)]
+    assert [product.id for product in products] == sorted(product.id for product in products)
+    assert all(product.created_at is not None for product in products)
+
+    total = await test_db.scalar(select(func.count()).select_from(Product))
+    assert total == count
+
+
+@pytest.mark.asyncio
+async def test_seed_small_batch_through_insert(test_db):
+    """Test that a seed file below the COPY threshold is inserted normally."""
+    products = await seed_products(test_db, _seed_payload(3))
+
+    assert [product.stock_quantity for product in products] == [0, 1, 2]
+    assert all(product.id is not None for product in products)
@@ -1,4 +1,5 @@
 # tests/integration/test_supplier_management.py
+import json
 import pytest
 from fastapi.testclient import TestClient
 
@@ -101,3 +102,72 @@ async def test_product_with_multiple_suppliers(client):
     retrieved_supplier_ids = [s["id"] for s in data["suppliers"]]
     for supplier_id in supplier_ids:
         assert supplier_id in retrieved_supplier_ids
+
+@pytest.mark.asyncio
+async def test_supplier_name_prefix_search_ignores_case(client):
+    """Test that a trailing * prefix search on name is case-insensitive."""
+    supplier_data = {
+        "name": "ACME Prefix Corp",
+        "contact_info": "acme@prefix.com",
+        "credit_rating": 2
+    }
+    client.post("/api/v1/suppliers/", json=supplier_data)
+    
+    response = client.get("/api/v1/suppliers/?name=acme prefix*")
+    assert response.status_code == 200
+    names = [item["name"] for item in response.json()["items"]]
+    assert "ACME Prefix Corp" in names
+
+@pytest.mark.asyncio
+async def test_stream_suppliers_ndjson(client):
+    """Test streaming filtered suppliers as newline-delimited JSON."""
+    for name, rating in (("Streamed Top Supplier", 5), ("Streamed Low Supplier", 1)):
+        client.post(
+            "/api/v1/suppliers/",
+            json={"name": name, "contact_info": "stream@supplier.com", "credit_rating": rating}
+        )
+    
+    response = client.get("/api/v1/suppliers/stream?min_rating=5")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    names = [row["name"] for row in rows]
+    assert "Streamed Top Supplier" in names
+    assert "Streamed Low Supplier" not in names
+    assert all(row["credit_rating"] == 5 for row in rows)
+    assert [row["id"] for row in rows] == sorted(row["id"] for row in rows)
+
+@pytest.mark.asyncio
+async def test_top_rated_suppliers_keyset_pages(client, sample_data):
+    """Test walking the top-rated ranking page by page without overlaps or gaps."""
+    for i, rating in enumerate((5, 4, 5, 3, 4)):
+        client.post(
+            "/api/v1/suppliers/",
+            json={"name": f"Ranked Supplier {i}", "contact_info": f"ranked{i}@supplier.com", "credit_rating": rating}
+        )
+    
+    response = client.get("/api/v1/suppliers/top-rated?limit=100")
+    assert response.status_code == 200
+    ranking = [(item["credit_rating"], item["id"]) for item in response.json()]
+    assert ranking == sorted(ranking, reverse=True)
+    
+    # Walk the same ranking two suppliers at a time
+    walked = []
+    params = {"limit": 2}
+    while True:
+        page = client.get("/api/v1/suppliers/top-rated", params=params).json()
+        walked.extend((item["credit_rating"], item["id"]) for item in page)
+        if len(page) < 2:
+            break
+        params = {"limit": 2, "after_rating": page[-1]["credit_rating"], "after_id": page[-1]["id"]}
+    
+    assert walked == ranking
+    assert len(set(walked)) == len(walked)
+    
+    # A new supplier clears the memoized ranking, so it shows up straight away
+    new_id = client.post(
+        "/api/v1/suppliers/",
+        json={"name": "Newly Ranked Supplier", "contact_info": "new@supplier.com", "credit_rating": 5}
+    ).json()["id"]
+    first_page = client.get("/api/v1/suppliers/top-rated", params={"limit": 2}).json()
+    assert first_page[0]["id"] == new_id
@@ -0,0 +1,89 @@
+# tests/unit/test_auth.py
+import time
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+from jwt import PyJWTError
+
+from app.api.v1.endpoints import auth
+
+
+@pytest.fixture(autouse=True)
+def clear_auth_caches():
+    """Start every test with empty auth caches."""
+    auth._jwt_cache.clear()
+    auth._user_cache.clear()
+    auth._verified_credentials_cache.clear()
+    yield
+    auth._jwt_cache.clear()
+    auth._user_cache.clear()
+    auth._verified_credentials_cache.clear()
+
+
+def test_decode_access_token_is_cached():
+    """Test that a decoded token is served from the cache on the next call."""
+    token = auth.create_access_token({"sub": "cacheuser"})
+
+    payload = auth.decode_access_token(token)
+    assert payload["sub"] == "cacheuser"
+
+    with patch.object(auth.jwt, "decode") as mock_decode:
+        assert auth.decode_access_token(token) == payload
+        mock_decode.assert_not_called()
+
+
+def test_decode_access_token_skips_expired_cache_entry():
+    """Test that a cached payload is not served past the token expiry."""
+    token = auth.create_access_token({"sub": "expireduser"})
+    key = auth._token_cache_key(token)
+    auth._jwt_cache[key] = ({"sub": "expireduser"}, time.time() - 1)
+
+    with patch.object(auth.jwt, "decode", side_effect=PyJWTError("expired")):
+        with pytest.raises(PyJWTError):
+            auth.decode_access_token(token)
+    assert key not in auth._jwt_cache
+
+
+def test_decode_access_token_does_not_cache_failures():
+    """Test that invalid tokens are never cached."""
+    token = auth.create_access_token({"sub": "baduser"}, expires_delta=timedelta(minutes=-1))
+
+    with pytest.raises(PyJWTError):
+        auth.decode_access_token(token)
+    assert len(auth._jwt_cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_get_cached_user_queries_database_once():
+    """Test that repeated user lookups reuse the cached user."""
+    user = object()
+    with patch.object(auth, "get_user", return_value=user) as mock_get_user:
+        assert await auth.get_cached_user(None, "cacheduser") is user
+        assert await auth.get_cached_user(None, "cacheduser") is user
+    mock_get_user.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_authenticate_user_caches_only_valid_credentials():
+    """Test that only successful logins are cached."""
+    user = MagicMock(hashed_password=auth.get_password_hash("correct-password"))
+    with patch.object(auth, "get_user", return_value=user) as mock_get_user:
+        assert await auth.authenticate_user(None, "loginuser", "wrong-password") is False
+        assert len(auth._verified_credentials_cache) == 0
+
+        assert await auth.authenticate_user(None, "loginuser", "correct-password") is user
+        assert await auth.authenticate_user(None, "loginuser", "correct-password") is user
+    assert mock_get_user.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_rejects_expired_payload_before_lookup():
+    """Test that an expired payload is rejected without a user lookup."""
+    expired_payload = {"sub": "staleuser", "exp": int(time.time()) - 1}
+    with patch.object(auth, "decode_access_token", return_value=expired_payload), \
+            patch.object(auth, "get_cached_user") as mock_get_cached_user:
+        with pytest.raises(auth.HTTPException) as exc_info:
+            await auth.get_current_user(token="stale-token", db=None)
+    assert exc_info.value.status_code == 401
+    mock_get_cached_user.assert_not_called()
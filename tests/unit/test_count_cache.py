@@ -0,0 +1,109 @@
+# tests/unit/test_count_cache.py
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.core.pagination import total_from_page
+from app.services import supplier as supplier_service_module
+from app.services.count_cache import CountCache, count_cache
+from app.services.supplier import SupplierService
+
+
+@pytest.fixture(autouse=True)
+def clear_count_cache():
+    """Start every test with no cached totals."""
+    count_cache.invalidate()
+    yield
+    count_cache.invalidate()
+
+
+def test_key_ignores_unset_filters_and_order():
+    """Test that keys skip None filters and do not depend on argument order."""
+    assert CountCache.key(name="acme", credit_rating=None, category="tools") == \
+        CountCache.key(category="tools", name="acme")
+    assert CountCache.key() == ()
+
+
+def test_key_freezes_range_and_list_filters():
+    """Test that min/max dicts and lists become hashable, order-stable key parts."""
+    key = CountCache.key(price_range={"max": 10, "min": 1}, ids=[3, 1])
+    assert key == CountCache.key(ids=[3, 1], price_range={"min": 1, "max": 10})
+    assert hash(key) is not None
+
+    cache = CountCache()
+    cache.set("products", key, 7)
+    assert cache.get("products", key) == 7
+
+
+def test_invalidate_is_per_table():
+    """Test that invalidating one table keeps the totals cached for others."""
+    cache = CountCache()
+    cache.set("suppliers", CountCache.key(), 5)
+    cache.set("products", CountCache.key(), 9)
+
+    cache.invalidate("suppliers")
+    assert cache.get("suppliers", CountCache.key()) is None
+    assert cache.get("products", CountCache.key()) == 9
+
+    cache.invalidate()
+    assert cache.get("products", CountCache.key()) is None
+
+
+def test_total_from_page():
+    """Test which pages prove the exact total on their own."""
+    assert total_from_page(20, 10, 4) == 24
+    assert total_from_page(0, 10, 0) == 0
+    assert total_from_page(20, 10, 10) is None
+    # An empty page past the start could be an offset beyond the end
+    assert total_from_page(20, 10, 0) is None
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_skips_count_and_corrects_short_page():
+    """Test that a hit fetches only the page and a short page overrides a stale total."""
+    service = SupplierService(MagicMock())
+    key = CountCache.key(credit_rating=3)
+    load_page_with_total = AsyncMock(return_value=(["a", "b"], 2))
+
+    # A miss runs the windowed query and seeds the cache
+    suppliers, total = await service._page_with_cached_total(
+        key, 0, 10, AsyncMock(), load_page_with_total
+    )
+    assert (suppliers, total) == (["a", "b"], 2)
+    assert count_cache.get("suppliers", key) == 2
+
+    # A full page on a hit keeps the cached total
+    load_page = AsyncMock(return_value=["c"] * 10)
+    count_cache.set("suppliers", key, 40)
+    suppliers, total = await service._page_with_cached_total(
+        key, 0, 10, load_page, load_page_with_total
+    )
+    assert total == 40
+    load_page_with_total.assert_awaited_once()
+
+    # A short page on a hit reports the exact total it proves
+    load_page = AsyncMock(return_value=["d", "e", "f"])
+    suppliers, total = await service._page_with_cached_total(
+        key, 10, 10, load_page, load_page_with_total
+    )
+    assert total == 13
+    load_page_with_total.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_supplier_writes_invalidate_cached_totals():
+    """Test that supplier writes drop supplier totals but keep other tables'."""
+    repository = MagicMock()
+    repository.create = AsyncMock(return_value=object())
+    repository.batch_delete = AsyncMock(return_value=[])
+    service = SupplierService(repository)
+
+    count_cache.set(supplier_service_module._COUNT_TABLE, CountCache.key(), 5)
+    count_cache.set("products", CountCache.key(), 9)
+    await service.create_supplier(None, supplier_in=MagicMock())
+    assert count_cache.get(supplier_service_module._COUNT_TABLE, CountCache.key()) is None
+    assert count_cache.get("products", CountCache.key()) == 9
+
+    count_cache.set(supplier_service_module._COUNT_TABLE, CountCache.key(), 5)
+    await service.batch_delete_suppliers(None, ids=[1])
+    assert count_cache.get(supplier_service_module._COUNT_TABLE, CountCache.key()) is None
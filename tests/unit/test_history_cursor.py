@@ -0,0 +1,45 @@
+# tests/unit/test_history_cursor.py
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.v1.endpoints.history import _next_cursor, _parse_cursor
+
+
+def test_cursor_round_trip():
+    """Test that the cursor for a full page decodes back to its last row."""
+    rows = [
+        {"id": 7, "timestamp": datetime(2024, 5, 1, 12, 0, 0)},
+        {"id": 3, "timestamp": datetime(2024, 4, 30, 8, 15, 30, 250000)},
+    ]
+
+    cursor = _next_cursor(rows, limit=2)
+    assert _parse_cursor(cursor) == (datetime(2024, 4, 30, 8, 15, 30, 250000), 3)
+
+
+def test_short_page_has_no_next_cursor():
+    """Test that a page shorter than the limit ends the listing."""
+    rows = [{"id": 7, "timestamp": datetime(2024, 5, 1)}]
+    assert _next_cursor(rows, limit=2) is None
+    assert _parse_cursor(None) is None
+    assert _parse_cursor("") is None
+
+
+@pytest.mark.parametrize("cursor", [
+    "not-a-cursor",
+    "2024-05-01T12:00:00",
+    "2024-05-01T12:00:00|abc",
+    "yesterday|5",
+])
+def test_malformed_cursor_is_rejected(cursor):
+    """Test that malformed cursors are a 400, not a server error."""
+    with pytest.raises(HTTPException) as exc_info:
+        _parse_cursor(cursor)
+    assert exc_info.value.status_code == 400
+
+
+def test_aware_cursor_is_normalized_to_naive_utc():
+    """Test that timezone-aware cursors compare against the naive UTC column."""
+    assert _parse_cursor("2024-05-01T12:00:00Z|5") == (datetime(2024, 5, 1, 12, 0, 0), 5)
+    assert _parse_cursor("2024-05-01T14:00:00+02:00|5") == (datetime(2024, 5, 1, 12, 0, 0), 5)
@@ -0,0 +1,61 @@
+# tests/unit/test_list_cache.py
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.repositories.base import write_version
+from app.repositories.product import ProductRepository
+from app.repositories.supplier import SupplierRepository
+
+
+def _fake_product(supplier_name):
+    now = datetime(2024, 1, 1)
+    supplier = SimpleNamespace(
+        id=1, name=supplier_name, contact_info="info", credit_rating=3,
+        created_at=now, updated_at=now
+    )
+    return SimpleNamespace(
+        id=1, name="Cached Product", price=9.99, description=None, stock_quantity=5,
+        category="Test", discount=0, created_at=now, updated_at=now, suppliers=[supplier]
+    )
+
+
+def _fake_db(*product_batches):
+    db = MagicMock()
+    results = []
+    for products in product_batches:
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = products
+        results.append(result)
+    db.execute = AsyncMock(side_effect=results)
+    return db
+
+
+def test_supplier_write_bumps_only_supplier_version():
+    """Test that a supplier write advances the supplier counter alone."""
+    before = write_version("products", "suppliers")
+    SupplierRepository()._on_write()
+    after = write_version("products", "suppliers")
+    assert after == (before[0], before[1] + 1)
+
+
+@pytest.mark.asyncio
+async def test_listing_cache_holds_payloads_and_drops_them_on_supplier_write():
+    """Test that cached pages are plain dicts and a supplier write forces a reload."""
+    repository = ProductRepository()
+    db = _fake_db([_fake_product("Old Name")], [_fake_product("New Name")])
+
+    first = await repository.get_multi_with_suppliers(db, skip=0, limit=10)
+    again = await repository.get_multi_with_suppliers(db, skip=0, limit=10)
+    assert db.execute.await_count == 1
+    assert again == first
+    assert isinstance(first[0], dict)
+    assert first[0]["suppliers"][0]["name"] == "Old Name"
+
+    # Renaming or deleting a supplier must not leave it in cached product pages
+    SupplierRepository()._on_write()
+    reloaded = await repository.get_multi_with_suppliers(db, skip=0, limit=10)
+    assert db.execute.await_count == 2
+    assert reloaded[0]["suppliers"][0]["name"] == "New Name"
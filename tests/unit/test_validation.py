@@ -106,4 +106,19 @@ def test_product_validation_discount(client):
     response = client.post("/api/v1/products/", json=product_data)
     assert response.status_code == 422
     data = response.json()
-    assert "discount" in str(data).lower()
\ No newline at end of file
+    assert "discount" in str(data).lower()
+
+
+def test_supplier_batch_validation_credit_rating(client):
+    """Test credit rating constraints are enforced for every supplier in a batch."""
+    batch_data = {
+        "suppliers": [
+            {"name": "Rated Supplier", "contact_info": "rated@supplier.com", "credit_rating": 3},
+            {"name": "Overrated Supplier", "contact_info": "over@supplier.com", "credit_rating": 6}
+        ]
+    }
+    
+    response = client.post("/api/v1/suppliers/batch/create", json=batch_data)
+    assert response.status_code == 422
+    data = response.json()
+    assert "credit_rating" in str(data).lower()